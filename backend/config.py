@@ -10,6 +10,7 @@ SETUP:
 
 from pydantic_settings import BaseSettings
 from typing import Optional
+from pathlib import Path
 
 
 class Settings(BaseSettings):
@@ -52,6 +53,13 @@ class Settings(BaseSettings):
     TWILIO_AUTH_TOKEN: str = "your_twilio_auth_token"
     TWILIO_WHATSAPP_NUMBER: str = "+14155238886"  # Sandbox number
     
+    # ==========================================================================
+    # LOCAL STATE (memory fallback spill files, office sync journals)
+    # ==========================================================================
+    # Defaults to the backend directory, so it doesn't depend on where uvicorn
+    # is started from. Point it at a mounted volume in production.
+    LOCAL_STATE_DIR: str = str(Path(__file__).resolve().parent)
+    
     # ==========================================================================
     # SECURITY
     # ==========================================================================
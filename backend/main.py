@@ -60,6 +60,12 @@ app.include_router(admin_router)
 @app.on_event("startup")
 async def startup():
     """Run on startup"""
+    from services.memory_service import memory_service
+    from services.office_sync_service import office_sync_service
+    
+    # Reload local state kept across restarts
+    memory_service.restore_local()
+    office_sync_service.restore_activity()
     
     # Check service configuration
     gemini_ok = settings.GOOGLE_API_KEY and settings.GOOGLE_API_KEY != "your_google_api_key"
@@ -105,6 +111,16 @@ ENDPOINTS
 """)
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Run on shutdown"""
+    from services.memory_service import memory_service
+    from services.office_sync_service import office_sync_service
+    
+    await office_sync_service.flush_journal()
+    await memory_service.aclose()
+
+
 # =============================================================================
 # ROOT
 # =============================================================================
@@ -18,13 +18,33 @@ Container Strategy:
 - Project-level filtering via metadata
 - This allows cross-project search within a company
 
+Runtime:
+- Served on uvloop (uvicorn --loop uvloop, from uvicorn[standard])
+- Supermemory calls share one pooled HTTP/2 client when h2 is installed
+
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, Deque, Callable, Tuple
+from collections import OrderedDict, deque
 from datetime import datetime
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+import asyncio
+import hashlib
+import heapq
+import io
+import itertools
 import json
+import math
+import os
+import re
+import time
+import uuid
+
+import httpx
 
 from config import settings
 from utils.logger import logger
@@ -37,6 +57,202 @@ except ImportError:
     SUPERMEMORY_SDK_AVAILABLE = False
     logger.warning("Supermemory SDK not installed. Run: pip install supermemory")
 
+# xxh3 for content-hash dedup keys; blake2b is the portable fallback.
+# Both are stable across processes, unlike hash().
+try:
+    import xxhash
+    
+    _hash64 = xxhash.xxh3_64_intdigest
+except ImportError:
+    def _hash64(data: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+# orjson is much faster for the local spill files; stdlib json keeps dev boxes working.
+# Both sides work on bytes so spill files are written and read without str round-trips.
+try:
+    import orjson
+    
+    def _json_dumpb(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumpb(obj: Any) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+    
+    _json_loads = json.loads
+
+# HTTP/2 lets concurrent Supermemory calls share one connection (needs httpx[http2])
+try:
+    import h2  # noqa: F401
+    
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Hyperscan screens spill-file lines for query words with SIMD literal matching;
+# without it lines are lowercased and checked with bytes.__contains__.
+try:
+    import hyperscan
+    
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+
+# Memory type -> key in get_local_stats()
+_TYPE_TO_STAT_KEY = {
+    "decision": "decisions",
+    "change_order": "change_orders",
+    "rfi": "rfis",
+    "query": "queries",
+    "document": "documents",
+    "photo": "photos",
+}
+_STAT_KEYS = ("total",) + tuple(_TYPE_TO_STAT_KEY.values())
+
+# Local fallback limits: hot memories kept in RAM per company/project bucket.
+# Every local add is also appended (off the event loop) to a JSONL file so
+# evicted memories stay searchable. A file keeps the newest LOCAL_SPILL_MAX
+# memories and is compacted back to that once it grows LOCAL_SPILL_SLACK past it.
+LOCAL_BUCKET_MAX = 10_000
+LOCAL_SPILL_MAX = 100_000
+LOCAL_SPILL_SLACK = 10_000
+LOCAL_SPILL_DIR = Path(settings.LOCAL_STATE_DIR) / ".memory_cache"
+
+# Search tie-break sequence for memories read back from a spill file
+# (hot memories count up from 0)
+_SPILLED_SEQ = -1
+
+# Recent Supermemory adds kept per company, merged into searches so fresh
+# memories show up before Supermemory has indexed them
+RECENT_ADDS_MAX = 200
+
+# Search result cache; any add for a company invalidates its entries.
+# Local results served during a Supermemory outage are never cached.
+SEARCH_CACHE_MAX = 4096
+SEARCH_CACHE_TTL_SECONDS = 120
+
+# Supermemory SDK retries (exponential backoff with jitter on connection
+# errors, 408/429 and 5xx) before an add falls back to local storage
+SUPERMEMORY_MAX_RETRIES = 3
+
+# Failed Supermemory adds kept for re-upload once Supermemory recovers
+# (their local copies are dropped once re-uploaded). Queued memories are
+# marked in their spill lines, so restore_local queues them again.
+REPLAY_QUEUE_MAX = 10_000
+
+# Max concurrent adds in add_memories_bulk (keeps under Supermemory rate limits)
+BULK_ADD_CONCURRENCY = 16
+
+# Max characters of each memory injected into the Gemini prompt
+PROMPT_CONTENT_LIMIT = 300
+
+# (metadata field, line template) pairs rendered when the field is set
+_ENRICHED_METADATA_FIELDS = (
+    ("decision", "\nDecision: {}"),
+    ("reason", "Reason: {}"),
+    ("approved_by", "Approved by: {}"),
+    ("old_spec", "Changed from: {}"),
+    ("new_spec", "Changed to: {}"),
+)
+_PROMPT_METADATA_FIELDS = (
+    ("decision", "   Decision: {}\n"),
+    ("approved_by", "   Approved by: {}\n"),
+    ("date", "   Date: {}\n"),
+)
+_AUDIT_METADATA_FIELDS = (
+    ("approved_by", "Approved by: {}"),
+    ("reason", "Reason: {}"),
+)
+
+# Fixed parts of the prompt context and audit trail, built once at import
+_PROMPT_ITEM_TEMPLATE = "\n{}. {}\n"
+_AUDIT_HEADER = "\n".join(["=" * 60, "AUDIT TRAIL", "=" * 60, ""])
+_AUDIT_RECORD_TEMPLATE = "--- Record {} ---\nDate: {}\nType: {}\nContent: {}"
+
+
+@lru_cache(maxsize=1024)
+def _container_tag(company_id: str) -> str:
+    """Supermemory container tag for a company (memoized, hit on every memory op)"""
+    return f"sitemind_{company_id}"
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> Set[str]:
+    """Lowercased word tokens used by the local inverted index"""
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def _content_key(memory_type: str, content: str) -> int:
+    """Stable 64-bit hash of a memory's type and whitespace/case-normalized content"""
+    normalized = f"{memory_type}\0{' '.join(content.lower().split())}"
+    return _hash64(normalized.encode("utf-8"))
+
+
+def _line_screen(needles: List[bytes]) -> Callable[[bytes], bool]:
+    """Build a predicate: does a raw line contain any needle (ASCII, case-insensitive)?"""
+    if HYPERSCAN_AVAILABLE:
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[re.escape(n.decode()).encode() for n in needles],
+                ids=list(range(len(needles))),
+                elements=len(needles),
+                flags=hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH,
+            )
+            scratch = hyperscan.Scratch(db)
+        except Exception as e:
+            logger.warning(f"Hyperscan compile failed, using plain screen: {e}")
+        else:
+            def screen(line: bytes) -> bool:
+                hits = []
+                # Returning True stops the scan at the first hit
+                db.scan(line, match_event_handler=lambda *_: hits.append(1) or True, scratch=scratch)
+                return bool(hits)
+            
+            return screen
+    
+    def screen(line: bytes) -> bool:
+        lowered = line.lower()
+        return any(n in lowered for n in needles)
+    
+    return screen
+
+
+def _idf(n_docs: int, doc_freq: int) -> float:
+    """BM25 inverse document frequency (always positive)"""
+    return math.log(1 + (n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def _memory_tokens(memory: Dict) -> Set[str]:
+    """Index tokens of a memory: its content plus metadata values"""
+    metadata = memory.get("metadata") or {}
+    metadata_str = " ".join(str(v) for v in metadata.values() if v)
+    return _tokenize(f"{memory.get('content', '')} {metadata_str}")
+
+
+@lru_cache(maxsize=1)
+def _utc_date_for_minute(minute: int) -> str:
+    return datetime.utcnow().date().isoformat()
+
+
+def _utc_date_str() -> str:
+    """Today's UTC date (YYYY-MM-DD), recomputed at most once a minute"""
+    return _utc_date_for_minute(int(time.time()) // 60)
+
+
+@lru_cache(maxsize=1)
+def _utc_iso_for_second(second: int) -> str:
+    return datetime.utcfromtimestamp(second).isoformat()
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as ISO-8601 at second precision, formatted once per second"""
+    return _utc_iso_for_second(int(time.time()))
+
 
 @dataclass
 class Memory:
@@ -80,17 +296,87 @@ class MemoryService:
         self.api_key = settings.SUPERMEMORY_API_KEY
         self.client = None
         
+        self._http_client: Optional[httpx.Client] = None
+        
         # Initialize Supermemory client if available
         if SUPERMEMORY_SDK_AVAILABLE and self._is_configured():
             try:
-                self.client = Supermemory(api_key=self.api_key)
+                # One pooled keep-alive client for every Supermemory call,
+                # so memory ops reuse connections instead of new TLS handshakes
+                self._http_client = httpx.Client(
+                    timeout=30.0,
+                    http2=HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=32,
+                        max_connections=64,
+                        keepalive_expiry=60,
+                    ),
+                )
+                self.client = Supermemory(
+                    api_key=self.api_key,
+                    http_client=self._http_client,
+                    max_retries=SUPERMEMORY_MAX_RETRIES,
+                )
                 logger.info("✅ Supermemory client initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize Supermemory: {e}")
         
         # Local fallback storage
-        self._local_memories: Dict[str, List[Dict]] = {}
-        self._memory_counter = 0
+        # Buckets are "company_project" -> {memory_id: memory}, oldest first
+        self._local_memories: Dict[str, "OrderedDict[str, Dict]"] = {}
+        self._local_ids = itertools.count(1)
+        
+        # Insertion sequence of hot memories, so search ties keep insertion order
+        self._local_seq = itertools.count()
+        
+        # Secondary index per bucket: memory_type -> memory ids
+        self._by_type: Dict[str, Dict[str, Set[str]]] = {}
+        
+        # Inverted index per bucket: word -> memory ids
+        self._word_index: Dict[str, Dict[str, Set[str]]] = {}
+        
+        # Dedup index per bucket: content hash -> memory id
+        self._content_keys: Dict[str, Dict[int, str]] = {}
+        
+        # Search results by arguments -> (expires_at, results), LRU ordered.
+        # Keys include a per-company version bumped on every add.
+        self._search_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cache_versions: Dict[str, int] = {}
+        
+        # Searches currently in flight, keyed by their arguments
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        
+        # Write-through cache of recent Supermemory adds per company
+        self._recent: Dict[str, Deque[Dict]] = {}
+        
+        # Supermemory adds that failed and went local, re-uploaded on recovery:
+        # {"add": client.add kwargs, "company_id", "project_id", "type",
+        #  "key": bucket key, "memory_id": local id}
+        self._replay_queue: Deque[Dict] = deque()
+        self._replay_ids: Set[str] = set()  # local ids in the queue
+        self._replay_task: Optional[asyncio.Future] = None
+        
+        # Running stats per "company_id" and "company_id/project_id"
+        self._local_stats: Dict[str, Dict[str, int]] = {}
+        
+        # Spill lines not yet written (bucket key -> [encoded lines]), spill files
+        # to compact (bucket key -> memory ids to drop), the task writing both in
+        # a worker thread, and each spill file's line count
+        self._spill_pending: Dict[str, List[bytes]] = {}
+        self._spill_compact: Dict[str, Set[str]] = {}
+        self._spill_flush: Optional[asyncio.Future] = None
+        self._spill_lines: Dict[str, int] = {}
+        
+        # Memory ids dropped from local storage whose spill lines may still be
+        # on disk (bucket key -> ids), skipped by spill scans until compacted
+        self._spill_dropped: Dict[str, Set[str]] = {}
+    
+    async def aclose(self):
+        """Write out queued spill lines and close pooled Supermemory connections (called on app shutdown)"""
+        await self.flush_spill()
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
     
     def _is_configured(self) -> bool:
         """Check if Supermemory is configured"""
@@ -102,7 +388,7 @@ class MemoryService:
     
     def _get_container_tag(self, company_id: str) -> str:
         """Get container tag for a company"""
-        return f"sitemind_{company_id}"
+        return _container_tag(company_id)
     
     # =========================================================================
     # ADD MEMORIES
@@ -131,35 +417,37 @@ class MemoryService:
         Returns:
             Memory record with ID
         """
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = _utc_now_iso()
+        
+        # New memory - cached searches for this company are stale
+        self._cache_versions[company_id] = self._cache_versions.get(company_id, 0) + 1
         
         # Build enriched content with metadata for better search
         enriched_content = self._build_enriched_content(
-            content, memory_type, project_id, metadata, timestamp
+            content, memory_type, project_id, metadata, _utc_date_str()
         )
         
+        replay = None
+        
         # Try Supermemory first
         if self.client:
+            container_tag = self._get_container_tag(company_id)
             try:
-                container_tag = self._get_container_tag(company_id)
-                
-                # Add to Supermemory
-                result = self.client.add(
+                # Add to Supermemory (blocking SDK call, run in a thread so
+                # bursts of adds overlap on the pooled connections)
+                result = await asyncio.to_thread(
+                    self.client.add,
                     content=enriched_content,
                     container_tag=container_tag,
                 )
                 
-                # Handle SDK response object (not dict)
-                if hasattr(result, 'id'):
-                    memory_id = result.id
-                elif hasattr(result, '__dict__'):
-                    memory_id = getattr(result, 'id', None) or f"sm_{timestamp}"
-                else:
-                    memory_id = f"sm_{timestamp}"
+                # Handle SDK response object (not dict). The timestamp is only
+                # second precision, so the fallback id must not be built from it.
+                memory_id = getattr(result, "id", None) or f"sm_{uuid.uuid4().hex}"
                 
-                logger.info(f"💾 Memory added to Supermemory: {content[:50]}...")
+                logger.info("💾 Memory added to Supermemory: {:.50}...", content)
                 
-                return Memory(
+                memory = Memory(
                     id=memory_id,
                     content=content,
                     memory_type=memory_type,
@@ -170,11 +458,97 @@ class MemoryService:
                     timestamp=timestamp,
                 )
                 
+                self._remember_recent(company_id, memory.to_dict())
+                
+                # Supermemory is reachable again - re-upload earlier failed adds
+                if self._replay_queue and self._replay_task is None:
+                    self._replay_task = asyncio.ensure_future(self._drain_replay_queue())
+                
+                return memory
+                
             except Exception as e:
+                # The SDK already retried transient errors with backoff
                 logger.error(f"Supermemory add error: {e}")
+                replay = {"content": enriched_content, "container_tag": container_tag}
         
         # Fallback to local storage
-        return self._add_local(company_id, project_id, content, memory_type, metadata, user_id, timestamp)
+        memory = self._add_local(company_id, project_id, content, memory_type, metadata, user_id, timestamp, replay)
+        
+        # Queue for re-upload (once - a repeated add returns the same local memory)
+        if replay is not None:
+            self._queue_replay(replay, company_id, project_id, memory_type, memory.id)
+        
+        return memory
+    
+    def _queue_replay(self, replay: Dict, company_id: str, project_id: str, memory_type: str, memory_id: str):
+        """Queue a local memory for re-upload, dropping the oldest entry when full"""
+        if memory_id in self._replay_ids:
+            return
+        
+        if len(self._replay_queue) >= REPLAY_QUEUE_MAX:
+            dropped = self._replay_queue.popleft()
+            self._replay_ids.discard(dropped["memory_id"])
+            logger.warning(f"⚠️ Supermemory replay queue full, {dropped['memory_id']} stays local until restart")
+        
+        self._replay_ids.add(memory_id)
+        self._replay_queue.append({
+            "add": replay,
+            "company_id": company_id,
+            "project_id": project_id,
+            "type": memory_type,
+            "key": f"{company_id}_{project_id}",
+            "memory_id": memory_id,
+        })
+    
+    def _remember_recent(self, company_id: str, memory_dict: Dict):
+        """Keep a Supermemory add in the company's recent-adds cache"""
+        recent = self._recent.get(company_id)
+        if recent is None:
+            recent = self._recent[company_id] = deque(maxlen=RECENT_ADDS_MAX)
+        recent.append(memory_dict)
+    
+    async def _drain_replay_queue(self):
+        """
+        Re-upload memories that fell back to local while Supermemory was down
+        
+        Each re-uploaded memory leaves local storage (hot bucket now, spill file
+        at the compaction queued here) and moves to the recent-adds cache, so
+        merged searches return it once.
+        """
+        try:
+            while self._replay_queue:
+                entry = self._replay_queue[0]
+                try:
+                    result = await asyncio.to_thread(self.client.add, **entry["add"])
+                except Exception as e:
+                    logger.error(f"Supermemory replay error: {e}")
+                    return
+                # A full queue may have dropped the entry while it was uploading
+                if self._replay_queue and self._replay_queue[0] is entry:
+                    self._replay_queue.popleft()
+                    self._replay_ids.discard(entry["memory_id"])
+                self._release_local(entry, getattr(result, "id", None) or f"sm_{uuid.uuid4().hex}")
+            logger.info("💾 Supermemory replay queue drained")
+        finally:
+            self._replay_task = None
+            if self._spill_compact:
+                self._schedule_spill_flush()
+    
+    def _release_local(self, entry: Dict, remote_id: str):
+        """Drop a re-uploaded memory's local copy (and its local stats)"""
+        company_id, key, memory_id = entry["company_id"], entry["key"], entry["memory_id"]
+        
+        memory_dict = self._drop_local(key, memory_id)
+        self._bump_local_stats(company_id, entry["project_id"], entry["type"], -1)
+        self._spill_compact.setdefault(key, set()).add(memory_id)
+        self._spill_dropped.setdefault(key, set()).add(memory_id)
+        self._spill_lines[key] = max(self._spill_lines.get(key, 0) - 1, 0)
+        self._cache_versions[company_id] = self._cache_versions.get(company_id, 0) + 1
+        
+        if memory_dict is not None:
+            recent = {k: v for k, v in memory_dict.items() if not k.startswith("_")}
+            recent["id"] = remote_id
+            self._remember_recent(company_id, recent)
     
     def _build_enriched_content(
         self,
@@ -182,29 +556,23 @@ class MemoryService:
         memory_type: str,
         project_id: str,
         metadata: Dict,
-        timestamp: str,
+        date_str: str,
     ) -> str:
         """Build enriched content with metadata for better search"""
         parts = [
             f"[{memory_type.upper()}]",
             f"[Project: {project_id}]",
-            f"[Date: {timestamp[:10]}]",
+            f"[Date: {date_str}]",
             "",
             content,
         ]
         
         # Add key metadata to content for search
         if metadata:
-            if metadata.get("decision"):
-                parts.append(f"\nDecision: {metadata['decision']}")
-            if metadata.get("reason"):
-                parts.append(f"Reason: {metadata['reason']}")
-            if metadata.get("approved_by"):
-                parts.append(f"Approved by: {metadata['approved_by']}")
-            if metadata.get("old_spec"):
-                parts.append(f"Changed from: {metadata['old_spec']}")
-            if metadata.get("new_spec"):
-                parts.append(f"Changed to: {metadata['new_spec']}")
+            for field, template in _ENRICHED_METADATA_FIELDS:
+                value = metadata.get(field)
+                if value:
+                    parts.append(template.format(value))
         
         return "\n".join(parts)
     
@@ -217,14 +585,36 @@ class MemoryService:
         metadata: Dict,
         user_id: str,
         timestamp: str,
+        replay: Dict = None,
     ) -> Memory:
-        """Add to local memory (fallback)"""
-        self._memory_counter += 1
-        memory_id = f"local_{self._memory_counter}_{timestamp}"
-        
+        """Add to local memory (fallback); replay is the Supermemory add to retry later"""
         key = f"{company_id}_{project_id}"
-        if key not in self._local_memories:
-            self._local_memories[key] = []
+        bucket = self._local_memories.get(key)
+        if bucket is None:
+            bucket = self._local_memories[key] = OrderedDict()
+            self._by_type[key] = {}
+            self._word_index[key] = {}
+            self._content_keys[key] = {}
+        
+        # Skip repeated ingests of the same memory (hash match, confirmed on content)
+        content_key = _content_key(memory_type, content)
+        existing_id = self._content_keys[key].get(content_key)
+        if existing_id is not None:
+            existing = bucket[existing_id]
+            if existing["content"] == content and existing["type"] == memory_type:
+                logger.info("💾 Duplicate memory skipped: {:.50}...", content)
+                return Memory(
+                    id=existing["id"],
+                    content=existing["content"],
+                    memory_type=existing["type"],
+                    project_id=existing["project_id"],
+                    company_id=existing["company_id"],
+                    user_id=existing["user_id"],
+                    metadata=existing["metadata"],
+                    timestamp=existing["timestamp"],
+                )
+        
+        memory_id = f"local_{next(self._local_ids)}_{timestamp}"
         
         memory = Memory(
             id=memory_id,
@@ -237,11 +627,256 @@ class MemoryService:
             timestamp=timestamp,
         )
         
-        self._local_memories[key].append(memory.to_dict())
-        logger.info(f"💾 Memory added locally: {content[:50]}...")
+        memory_dict = memory.to_dict()
+        if replay is not None:
+            memory_dict["_replay"] = replay  # spilled with it, re-queued on restore
+        self._spill_local(key, memory_dict)
+        self._index_local(key, memory_dict, content_key)
+        if len(bucket) > LOCAL_BUCKET_MAX:
+            self._evict_local(key)
+        
+        self._bump_local_stats(company_id, project_id, memory_type)
+        logger.info("💾 Memory added locally: {:.50}...", content)
         
         return memory
     
+    def _index_local(self, key: str, memory_dict: Dict, content_key: int):
+        """Put a memory in its hot bucket and the bucket's indexes"""
+        memory_id = memory_dict["id"]
+        
+        # Tokenize once at insert; searches only intersect sets
+        memory_dict["_tokens"] = frozenset(_memory_tokens(memory_dict))
+        
+        memory_dict["_content_key"] = content_key
+        memory_dict["_seq"] = next(self._local_seq)
+        
+        self._local_memories[key][memory_id] = memory_dict
+        self._content_keys[key][content_key] = memory_id
+        self._by_type[key].setdefault(memory_dict.get("type"), set()).add(memory_id)
+        word_index = self._word_index[key]
+        for token in memory_dict["_tokens"]:
+            word_index.setdefault(token, set()).add(memory_id)
+    
+    def restore_local(self):
+        """
+        Rebuild hot buckets, stats and the replay queue from spill files after a restart
+        
+        Memories that went local during a Supermemory outage would otherwise
+        be invisible until re-ingested, and never re-uploaded. Only the newest
+        LOCAL_BUCKET_MAX per bucket are indexed; older ones stay searchable
+        through the spill scan. Call once from the app's startup hook, before
+        any local adds.
+        """
+        if not LOCAL_SPILL_DIR.is_dir():
+            return
+        
+        restored = 0
+        max_id = 0
+        for path in LOCAL_SPILL_DIR.glob("*.jsonl"):
+            key = path.stem
+            newest: Deque[Dict] = deque(maxlen=LOCAL_BUCKET_MAX)
+            lines = 0
+            for mem in self._iter_spilled(key):
+                lines += 1
+                newest.append(mem)
+                self._bump_local_stats(mem.get("company_id"), mem.get("project_id"), mem.get("type"))
+                if mem.get("_replay"):
+                    self._queue_replay(
+                        mem["_replay"], mem.get("company_id"), mem.get("project_id"), mem.get("type"), mem.get("id"),
+                    )
+                parts = str(mem.get("id", "")).split("_", 2)
+                if len(parts) > 1 and parts[1].isdigit():
+                    max_id = max(max_id, int(parts[1]))
+            self._spill_lines[key] = min(lines, LOCAL_SPILL_MAX)
+            if lines > LOCAL_SPILL_MAX:
+                self._spill_compact.setdefault(key, set())
+            if not newest:
+                continue
+            
+            self._local_memories[key] = OrderedDict()
+            self._by_type[key] = {}
+            self._word_index[key] = {}
+            self._content_keys[key] = {}
+            for mem in newest:
+                self._index_local(key, mem, _content_key(mem.get("type"), mem.get("content", "")))
+            restored += len(newest)
+        
+        # Don't hand out ids that are already on disk
+        self._local_ids = itertools.count(max_id + 1)
+        if self._spill_compact:
+            self._schedule_spill_flush()
+        if restored:
+            logger.info(f"💾 Restored {restored} local memories from {LOCAL_SPILL_DIR}")
+    
+    def _evict_local(self, key: str):
+        """Drop the oldest hot memory of a bucket (it stays in the spill file)"""
+        memory_id, memory_dict = self._local_memories[key].popitem(last=False)
+        self._unindex_local(key, memory_id, memory_dict)
+    
+    def _drop_local(self, key: str, memory_id: str) -> Optional[Dict]:
+        """Remove a memory from its hot bucket, if it's still there"""
+        bucket = self._local_memories.get(key)
+        memory_dict = bucket.pop(memory_id, None) if bucket is not None else None
+        if memory_dict is not None:
+            self._unindex_local(key, memory_id, memory_dict)
+        return memory_dict
+    
+    def _unindex_local(self, key: str, memory_id: str, memory_dict: Dict):
+        """Remove a memory taken out of its hot bucket from the bucket's indexes"""
+        content_keys = self._content_keys[key]
+        if content_keys.get(memory_dict["_content_key"]) == memory_id:
+            del content_keys[memory_dict["_content_key"]]
+        
+        type_ids = self._by_type[key].get(memory_dict.get("type"))
+        if type_ids:
+            type_ids.discard(memory_id)
+        
+        word_index = self._word_index[key]
+        for token in memory_dict["_tokens"]:
+            token_ids = word_index.get(token)
+            if token_ids is not None:
+                token_ids.discard(memory_id)
+                if not token_ids:
+                    del word_index[token]
+    
+    def _spill_path(self, key: str) -> Path:
+        """JSONL file backing a local memory bucket"""
+        return LOCAL_SPILL_DIR / f"{key}.jsonl"
+    
+    def _spill_local(self, key: str, memory_dict: Dict):
+        """Queue a local memory for its bucket's JSONL file"""
+        try:
+            line = _json_dumpb(memory_dict)
+        except Exception as e:
+            logger.error(f"Local memory spill error: {e}")
+            return
+        self._spill_pending.setdefault(key, []).append(line)
+        
+        lines = self._spill_lines[key] = self._spill_lines.get(key, 0) + 1
+        if lines > LOCAL_SPILL_MAX + LOCAL_SPILL_SLACK:
+            self._spill_compact.setdefault(key, set())
+            self._spill_lines[key] = LOCAL_SPILL_MAX
+        
+        self._schedule_spill_flush()
+    
+    def _schedule_spill_flush(self):
+        """Write queued spill work in a worker thread (inline when there is no event loop)"""
+        if self._spill_flush is not None:
+            return  # the running flush picks it up
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._spill_compacted(self._write_spill(*self._take_spill_work()))
+            return
+        self._spill_flush = asyncio.ensure_future(self._flush_spill())
+    
+    def _take_spill_work(self):
+        pending, self._spill_pending = self._spill_pending, {}
+        compact, self._spill_compact = self._spill_compact, {}
+        return pending, compact
+    
+    async def _flush_spill(self):
+        try:
+            while self._spill_pending or self._spill_compact:
+                compacted = await asyncio.to_thread(self._write_spill, *self._take_spill_work())
+                self._spill_compacted(compacted)
+        finally:
+            self._spill_flush = None
+    
+    async def flush_spill(self):
+        """Wait until queued local memories are written to their spill files"""
+        if self._spill_flush is not None:
+            await self._spill_flush
+        if self._spill_pending or self._spill_compact:
+            compacted = await asyncio.to_thread(self._write_spill, *self._take_spill_work())
+            self._spill_compacted(compacted)
+    
+    def _write_spill(
+        self,
+        pending: Dict[str, List[bytes]],
+        compact: Dict[str, Set[str]],
+    ) -> Dict[str, Set[str]]:
+        """
+        Append queued lines (one write per file), then compact the files that need it
+        
+        Returns the dropped ids that compaction removed from disk, by bucket key.
+        """
+        try:
+            LOCAL_SPILL_DIR.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.error(f"Local memory spill error: {e}")
+            return {}
+        for key, lines in pending.items():
+            try:
+                with open(self._spill_path(key), "ab") as f:
+                    f.write(b"".join(lines))
+            except OSError as e:
+                logger.error(f"Local memory spill error ({key}): {e}")
+        return {
+            key: drop_ids
+            for key, drop_ids in compact.items()
+            if self._compact_spill(key, drop_ids)
+        }
+    
+    def _spill_compacted(self, compacted: Dict[str, Set[str]]):
+        """Stop skipping dropped ids once compaction has removed them from disk"""
+        for key, drop_ids in compacted.items():
+            dropped = self._spill_dropped.get(key)
+            if dropped is not None:
+                dropped -= drop_ids
+                if not dropped:
+                    del self._spill_dropped[key]
+    
+    def _compact_spill(self, key: str, drop_ids: Set[str]) -> bool:
+        """Rewrite a spill file with its newest LOCAL_SPILL_MAX memories, minus drop_ids"""
+        path = self._spill_path(key)
+        if not path.exists():
+            return True
+        
+        newest: Deque[bytes] = deque(maxlen=LOCAL_SPILL_MAX)
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    if drop_ids and _json_loads(line).get("id") in drop_ids:
+                        continue
+                    newest.append(line)
+            with open(tmp_path, "wb") as f:
+                f.writelines(newest)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Local memory spill compaction error ({key}): {e}")
+            return False
+        return True
+    
+    def _iter_spilled(self, key: str, screen_tokens: Set[str] = None):
+        """
+        Stream memories from a bucket's JSONL file
+        
+        With screen_tokens, only lines whose raw bytes contain one of the
+        tokens are parsed - the rest can't match and are never decoded.
+        """
+        path = self._spill_path(key)
+        if not path.exists():
+            return
+        
+        screen = None
+        if screen_tokens and all(t.isascii() for t in screen_tokens):
+            screen = _line_screen([t.encode() for t in screen_tokens])
+        
+        try:
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    if screen is not None and not screen(line):
+                        continue
+                    yield _json_loads(line)
+        except Exception as e:
+            logger.error(f"Local memory spill read error: {e}")
+    
     # =========================================================================
     # SEARCH MEMORIES
     # =========================================================================
@@ -267,6 +902,59 @@ class MemoryService:
         Returns:
             List of matching memories with scores
         """
+        key = (
+            company_id,
+            self._cache_versions.get(company_id, 0),
+            query,
+            project_id,
+            tuple(memory_types or ()),
+            limit,
+        )
+        
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            expires_at, results = cached
+            if expires_at > time.monotonic():
+                self._search_cache.move_to_end(key)
+                # Copies - result dicts are shared with the cache
+                return [dict(r) for r in results]
+            del self._search_cache[key]
+        
+        # Identical searches already in flight share one lookup (singleflight)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._execute_search(company_id, query, project_id, memory_types, limit)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shield so one cancelled caller doesn't cancel the others
+        results, cacheable = await asyncio.shield(task)
+        
+        if cacheable:
+            self._search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL_SECONDS, results)
+            self._search_cache.move_to_end(key)
+            if len(self._search_cache) > SEARCH_CACHE_MAX:
+                self._search_cache.popitem(last=False)
+        
+        # Copies - result dicts are shared with the cache and other waiters
+        return [dict(r) for r in results]
+    
+    async def _execute_search(
+        self,
+        company_id: str,
+        query: str,
+        project_id: str,
+        memory_types: List[str],
+        limit: int,
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Run a search against Supermemory, falling back to local
+        
+        Returns (results, cacheable). Fallback results after a Supermemory
+        error aren't cacheable - they'd hide remote results once it recovers.
+        """
         # Build search query with filters
         search_query = query
         if project_id:
@@ -280,8 +968,10 @@ class MemoryService:
             try:
                 container_tag = self._get_container_tag(company_id)
                 
-                # Use search.execute for semantic search
-                result = self.client.search.execute(
+                # Use search.execute for semantic search (blocking SDK call,
+                # run in a thread so concurrent searches don't stall the loop)
+                result = await asyncio.to_thread(
+                    self.client.search.execute,
                     container_tags=[container_tag],
                     q=search_query,
                     limit=limit,
@@ -292,7 +982,7 @@ class MemoryService:
                 
                 # Parse results with full context
                 parsed = []
-                for res in results_list[:limit]:
+                for res in results_list:
                     # Get content from chunks
                     content = ""
                     if res.chunks:
@@ -326,29 +1016,75 @@ class MemoryService:
                         "created_at": created_at,
                         "metadata": self._extract_metadata(content),
                     })
+                    if len(parsed) >= limit:
+                        break
+                
+                parsed = self._merge_recent(company_id, project_id, query, memory_types, limit, parsed)
                 
-                logger.info(f"🔍 Supermemory search: '{query[:30]}...' → {len(parsed)} results")
-                return parsed[:limit]
+                logger.info("🔍 Supermemory search: '{:.30}...' → {} results", query, len(parsed))
+                return parsed, True
                 
             except Exception as e:
                 logger.error(f"Supermemory search error: {e}")
+                return await self._search_local(company_id, project_id, query, memory_types, limit), False
         
-        # Fallback to local search
-        return self._search_local(company_id, project_id, query, memory_types, limit)
+        # Local-only (no Supermemory client) - local adds invalidate the cache
+        return await self._search_local(company_id, project_id, query, memory_types, limit), True
+    
+    def _merge_recent(
+        self,
+        company_id: str,
+        project_id: str,
+        query: str,
+        memory_types: List[str],
+        limit: int,
+        results: List[Dict],
+    ) -> List[Dict]:
+        """
+        Merge matching recent adds into remote results (dedupe by id, re-sort)
+        
+        Recent adds are scored as the share of query words they match, without
+        the exact-phrase boost, so they rank on the same 0-1 scale as
+        Supermemory scores instead of always outranking them.
+        """
+        recent = self._recent.get(company_id)
+        if not recent:
+            return results
+        
+        query_lower = query.lower()
+        query_tokens = _tokenize(query)
+        
+        merged = {r.get("id"): r for r in results}
+        for mem in recent:
+            if mem["id"] in merged:
+                continue
+            if project_id and mem["project_id"] != project_id:
+                continue
+            
+            result = self._score_local(mem, query_lower, query_tokens, memory_types, phrase_boost=False)
+            if result:
+                result["created_at"] = mem["timestamp"]
+                merged[result["id"]] = result
+        
+        if len(merged) == len(results):
+            return results
+        
+        return heapq.nlargest(limit, merged.values(), key=itemgetter("score"))
     
     def _extract_clean_content(self, enriched_content: str) -> str:
         """Extract clean content from enriched format"""
-        # The content includes metadata in format: [TYPE] [Project: X] [Date: Y] actual content
-        # We want to preserve the actual content and key metadata
-        
         # If content is empty or just metadata
         if not enriched_content or not enriched_content.strip():
             return ""
         
-        # Try to extract content after the metadata prefix
-        # Pattern: [INFO] [Project: marina_tower_b] [Date: 2025-12-08] Actual content here
-        import re
+        # Fast path - _build_enriched_content writes the metadata tag lines,
+        # one blank line, then the actual content
+        idx = enriched_content.find("\n\n")
+        if idx != -1 and enriched_content.startswith("["):
+            return enriched_content[idx + 2:]
         
+        # Older single-line format:
+        # [INFO] [Project: marina_tower_b] [Date: 2025-12-08] Actual content here
         # Find where actual content starts (after last ] )
         match = re.search(r'\] ([^[\]]+)$', enriched_content)
         if match:
@@ -384,7 +1120,7 @@ class MemoryService:
         
         return metadata
     
-    def _search_local(
+    async def _search_local(
         self,
         company_id: str,
         project_id: str,
@@ -393,8 +1129,8 @@ class MemoryService:
         limit: int,
     ) -> List[Dict]:
         """Search local memories (fallback)"""
-        # Collect all relevant memories
-        all_memories = []
+        # Collect all relevant buckets
+        buckets = []
         
         for key, memories in self._local_memories.items():
             if not key.startswith(company_id):
@@ -403,47 +1139,121 @@ class MemoryService:
             if project_id and not key.endswith(project_id):
                 continue
             
-            all_memories.extend(memories)
+            buckets.append((key, memories))
         
         # Score by keyword matching
         query_lower = query.lower()
-        query_words = set(query_lower.split())
+        query_tokens = _tokenize(query)
         
         scored = []
-        for mem in all_memories:
-            # Filter by type (check 'type', 'memory_type', and nested in metadata)
-            mem_type = mem.get("type") or mem.get("memory_type") or mem.get("metadata", {}).get("type")
-            if memory_types and mem_type not in memory_types:
-                continue
+        for key, memories in buckets:
+            # Only memories sharing a word with the query can score
+            word_index = self._word_index[key]
+            candidate_ids = set().union(*(word_index.get(t, ()) for t in query_tokens))
             
-            content = mem.get("content", "").lower()
+            if memory_types and candidate_ids:
+                # Narrow to the requested types before any content scoring
+                type_index = self._by_type[key]
+                candidate_ids &= set().union(*(type_index.get(t, ()) for t in memory_types))
             
-            # Also search in metadata for better matching
-            metadata = mem.get("metadata", {})
-            metadata_str = " ".join(str(v) for v in metadata.values() if v).lower()
-            searchable = f"{content} {metadata_str}"
+            # Rare words count more (BM25 idf, document frequency = postings size)
+            n_docs = len(memories)
+            weights = {t: _idf(n_docs, len(word_index.get(t, ()))) for t in query_tokens}
             
-            # Score: count matching words
-            score = sum(1 for word in query_words if word in searchable)
-            
-            # Boost score for exact phrase match
-            if query_lower in searchable:
-                score += 2
-            
-            if score > 0:
-                scored.append({
-                    "id": mem.get("id"),
-                    "content": mem.get("content"),
-                    "score": score / len(query_words),  # Normalize
-                    "metadata": metadata,
-                    "type": mem_type,
-                })
+            for mem_id in candidate_ids:
+                mem = memories[mem_id]
+                result = self._score_local(mem, query_lower, query_tokens, memory_types, weights)
+                if result:
+                    scored.append((result, mem["_seq"]))
+        
+        # Not enough hot matches - stream evicted memories from disk. Every
+        # local add is spilled, so a file with more lines than its hot bucket
+        # holds evicted memories.
+        if len(scored) < limit:
+            spilled_keys = [
+                key for key, memories in buckets
+                if self._spill_lines.get(key, 0) > len(memories)
+            ]
+            if spilled_keys:
+                # The scan reads and parses up to a whole file - keep it off the event loop
+                spilled = await asyncio.to_thread(
+                    self._scan_spilled, spilled_keys, query_lower, query_tokens, memory_types
+                )
+                for key, result in spilled:
+                    # Skip memories still hot or already dropped (e.g. replayed)
+                    if result["id"] in self._local_memories[key] or result["id"] in self._spill_dropped.get(key, ()):
+                        continue
+                    # Evicted memories are older than every hot one
+                    scored.append((result, _SPILLED_SEQ))
         
-        # Sort by score
-        scored.sort(key=lambda x: -x["score"])
+        # Top-k by score without sorting every match; equal scores keep
+        # insertion order (lower _seq first, spilled in file order)
+        top = heapq.nlargest(limit, scored, key=lambda e: (e[0]["score"], -e[1]))
         
-        logger.info(f"🔍 Local search: '{query[:30]}...' → {len(scored[:limit])} results")
-        return scored[:limit]
+        logger.info("🔍 Local search: '{:.30}...' → {} results", query, len(top))
+        return [result for result, _ in top]
+    
+    def _scan_spilled(
+        self,
+        keys: List[str],
+        query_lower: str,
+        query_tokens: Set[str],
+        memory_types: List[str],
+    ) -> List[Tuple[str, Dict]]:
+        """Keyword-score spill file memories (runs in a worker thread, file order)"""
+        matches = []
+        for key in keys:
+            for mem in self._iter_spilled(key, query_tokens):
+                result = self._score_local(mem, query_lower, query_tokens, memory_types)
+                if result:
+                    matches.append((key, result))
+        return matches
+    
+    def _score_local(
+        self,
+        mem: Dict,
+        query_lower: str,
+        query_tokens: Set[str],
+        memory_types: List[str],
+        weights: Dict[str, float] = None,
+        phrase_boost: bool = True,
+    ) -> Optional[Dict]:
+        """
+        Keyword-score a local memory, None if it doesn't match
+        
+        Score is the weighted share of query words matched (unweighted
+        when no idf weights are given, always within 0-1), plus a boost
+        for an exact phrase unless phrase_boost is off.
+        """
+        # Filter by type (check 'type', 'memory_type', and nested in metadata)
+        mem_type = mem.get("type") or mem.get("memory_type") or mem.get("metadata", {}).get("type")
+        if memory_types and mem_type not in memory_types:
+            return None
+        
+        # Score: count matching words (tokens precomputed for hot memories)
+        tokens = mem.get("_tokens")
+        if tokens is None:
+            tokens = _memory_tokens(mem)
+        matched = query_tokens & tokens
+        if not matched:
+            return None
+        
+        if weights:
+            score = sum(weights[t] for t in matched) / sum(weights.values())
+        else:
+            score = len(matched) / len(query_tokens)
+        
+        # Boost score for exact phrase match
+        if phrase_boost and query_lower in mem.get("content", "").lower():
+            score += 2 / len(query_tokens)
+        
+        return {
+            "id": mem.get("id"),
+            "content": mem.get("content"),
+            "score": score,
+            "metadata": mem.get("metadata", {}),
+            "type": mem_type,
+        }
     
     # =========================================================================
     # GET CONTEXT FOR AI
@@ -467,51 +1277,55 @@ class MemoryService:
         
         Returns context optimized for Gemini prompt injection
         """
-        context = []
-        
         # 1. CONVERSATION HISTORY - Critical for continuity!
         # "What's the cover?" → "40mm" → "And for beams?" needs this!
-        if user_id:
+        async def conversation_history() -> List[Dict]:
+            if not user_id:
+                return []
             recent_conversation = await self.get_recent_conversation(
                 company_id=company_id,
                 user_id=user_id,
                 limit=5,  # Last 5 Q&A pairs
             )
-            if recent_conversation:
-                context.append({
-                    "type": "conversation_history",
-                    "content": recent_conversation,
-                    "is_conversation": True,
-                })
-        
-        # 2. Semantic search for query
-        results = await self.search(
-            company_id=company_id,
-            query=query,
-            project_id=project_id,
-            memory_types=include_types,
-            limit=5,
-        )
-        context.extend(results)
+            if not recent_conversation:
+                return []
+            return [{
+                "type": "conversation_history",
+                "content": recent_conversation,
+                "is_conversation": True,
+            }]
+        
+        lookups = [
+            conversation_history(),
+            # 2. Semantic search for query
+            self.search(
+                company_id=company_id,
+                query=query,
+                project_id=project_id,
+                memory_types=include_types,
+                limit=5,
+            ),
+        ]
         
         # 3. Recent decisions (always relevant)
         if not include_types or "decision" in include_types:
-            decisions = await self.search(
+            lookups.append(self.search(
                 company_id=company_id,
                 query="decision change approved",
                 project_id=project_id,
                 memory_types=["decision", "change_order"],
                 limit=3,
-            )
-            
-            # Add if not duplicate
-            existing_ids = {c.get("id") for c in context}
-            for d in decisions:
-                if d.get("id") not in existing_ids:
-                    context.append(d)
+            ))
+        
+        # Run lookups concurrently, dedupe by id while keeping order
+        context: Dict[Any, Dict] = {}
+        for items in await asyncio.gather(*lookups):
+            for item in items:
+                key = "conversation_history" if item.get("is_conversation") else item.get("id")
+                context.setdefault(key, item)
         
         # Limit total context
-        return context[:10]
+        return list(context.values())[:10]
     
     async def get_recent_conversation(
         self,
@@ -562,24 +1376,23 @@ class MemoryService:
         if not context:
             return ""
         
-        lines = ["**Relevant Project Context:**", ""]
+        buf = io.StringIO()
+        buf.write("**Relevant Project Context:**\n")
         
         for i, item in enumerate(context, 1):
-            content = item.get("content", "")[:300]
+            content = item.get("content", "")
+            if len(content) > PROMPT_CONTENT_LIMIT:
+                content = content[:PROMPT_CONTENT_LIMIT]
             metadata = item.get("metadata", {})
             
-            lines.append(f"{i}. {content}")
-            
-            if metadata.get("decision"):
-                lines.append(f"   Decision: {metadata['decision']}")
-            if metadata.get("approved_by"):
-                lines.append(f"   Approved by: {metadata['approved_by']}")
-            if metadata.get("date"):
-                lines.append(f"   Date: {metadata['date']}")
+            buf.write(_PROMPT_ITEM_TEMPLATE.format(i, content))
             
-            lines.append("")
+            for field, template in _PROMPT_METADATA_FIELDS:
+                value = metadata.get(field)
+                if value:
+                    buf.write(template.format(value))
         
-        return "\n".join(lines)
+        return buf.getvalue()
     
     # =========================================================================
     # SPECIALIZED ADD METHODS
@@ -772,6 +1585,39 @@ class MemoryService:
             user_id=user_id,
         )
     
+    # =========================================================================
+    # BULK ADD
+    # =========================================================================
+    
+    async def add_memories_bulk(self, entries: List[Dict]) -> List[Optional[Memory]]:
+        """
+        Add many memories concurrently (e.g. importing historical RFIs)
+        
+        Args:
+            entries: add_memory keyword arguments, one dict per memory
+            
+        Returns:
+            Memory per entry, in order (None where the add failed)
+        """
+        semaphore = asyncio.Semaphore(BULK_ADD_CONCURRENCY)
+        
+        async def add_one(entry: Dict) -> Memory:
+            async with semaphore:
+                return await self.add_memory(**entry)
+        
+        results = await asyncio.gather(*(add_one(e) for e in entries), return_exceptions=True)
+        
+        memories = []
+        for entry, result in zip(entries, results):
+            if isinstance(result, Exception):
+                logger.error(f"Bulk memory add error: {result}")
+                memories.append(None)
+            else:
+                memories.append(result)
+        
+        logger.info("💾 Bulk add: {}/{} memories", len(entries) - memories.count(None), len(entries))
+        return memories
+    
     # =========================================================================
     # AUDIT TRAIL
     # =========================================================================
@@ -800,24 +1646,21 @@ class MemoryService:
     
     def format_audit_trail(self, trail: List[Dict]) -> str:
         """Format audit trail for export/display"""
-        lines = [
-            "=" * 60,
-            "AUDIT TRAIL",
-            "=" * 60,
-            "",
-        ]
+        lines = [_AUDIT_HEADER]
         
         for i, item in enumerate(trail, 1):
             metadata = item.get("metadata", {})
-            lines.append(f"--- Record {i} ---")
-            lines.append(f"Date: {metadata.get('date', 'Unknown')}")
-            lines.append(f"Type: {metadata.get('type', 'Unknown').upper()}")
-            lines.append(f"Content: {item.get('content', '')}")
+            lines.append(_AUDIT_RECORD_TEMPLATE.format(
+                i,
+                metadata.get("date", "Unknown"),
+                metadata.get("type", "Unknown").upper(),
+                item.get("content", ""),
+            ))
             
-            if metadata.get("approved_by"):
-                lines.append(f"Approved by: {metadata['approved_by']}")
-            if metadata.get("reason"):
-                lines.append(f"Reason: {metadata['reason']}")
+            for field, template in _AUDIT_METADATA_FIELDS:
+                value = metadata.get(field)
+                if value:
+                    lines.append(template.format(value))
             
             lines.append("")
         
@@ -827,31 +1670,23 @@ class MemoryService:
     # STATS
     # =========================================================================
     
+    def _bump_local_stats(self, company_id: str, project_id: str, memory_type: str, delta: int = 1):
+        """Update running stats for a locally stored (or, with delta=-1, dropped) memory"""
+        stat_key = _TYPE_TO_STAT_KEY.get(memory_type)
+        
+        for key in (company_id, f"{company_id}/{project_id}"):
+            stats = self._local_stats.get(key)
+            if stats is None:
+                stats = self._local_stats[key] = dict.fromkeys(_STAT_KEYS, 0)
+            stats["total"] += delta
+            if stat_key:
+                stats[stat_key] += delta
+    
     def get_local_stats(self, company_id: str, project_id: str = None) -> Dict[str, int]:
         """Get memory stats (local only - for billing estimates)"""
-        stats = {
-            "total": 0,
-            "decisions": 0,
-            "change_orders": 0,
-            "rfis": 0,
-            "queries": 0,
-            "documents": 0,
-            "photos": 0,
-        }
-        
-        for key, memories in self._local_memories.items():
-            if not key.startswith(company_id):
-                continue
-            if project_id and not key.endswith(project_id):
-                continue
-            
-            for mem in memories:
-                stats["total"] += 1
-                mem_type = mem.get("memory_type", "other")
-                if mem_type in stats:
-                    stats[mem_type] += 1
-        
-        return stats
+        key = f"{company_id}/{project_id}" if project_id else company_id
+        stats = self._local_stats.get(key)
+        return dict(stats) if stats else dict.fromkeys(_STAT_KEYS, 0)
 
 
 # Singleton instance
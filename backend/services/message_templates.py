@@ -17,6 +17,13 @@ from typing import List, Dict, Optional
 from datetime import datetime
 
 
+# Monthly subscription used for ROI in value reports (₹83,000)
+SUBSCRIPTION_LAKH = 0.83
+
+# Alert severity -> icon; anything not listed shows as 🟠
+_SEVERITY_ICONS = {"critical": "🔴"}
+
+
 class MessageTemplates:
     """
     Enterprise-grade message templates for WhatsApp
@@ -31,6 +38,202 @@ class MessageTemplates:
     SEPARATOR = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
     THIN_SEP = "───────────────────────────────────────"
     
+    # =========================================================================
+    # TEMPLATES - separators baked in once at import, filled with format_map
+    # =========================================================================
+    
+    _AI_ANSWER_TMPL = f"""
+{SEPARATOR}
+💬 *{{project_name}}*
+{SEPARATOR}
+
+{{answer}}{{citation_section}}
+
+{THIN_SEP}
+_Ask follow-up questions anytime._
+"""
+    
+    _PHOTO_MATCH_TMPL = f"""
+{SEPARATOR}
+✅ *PHOTO VERIFIED*
+{SEPARATOR}
+
+{{analysis}}{{location_text}}
+
+{THIN_SEP}
+📐 *Verified Against:*
+{{specs_text}}
+
+{SEPARATOR}
+_Photo stored in project memory._
+"""
+    
+    _PHOTO_MISMATCH_TMPL = f"""
+{SEPARATOR}
+🚨 *MISMATCH DETECTED*
+{SEPARATOR}
+
+{{analysis}}
+
+{THIN_SEP}
+⚠️ *Discrepancy Found:*
+{THIN_SEP}
+
+📷 *What I see:* {{detected}}
+📐 *What spec says:* {{expected}}
+📄 *Source:* {{source_doc}}
+
+{SEPARATOR}
+💰 *COST IF NOT FIXED*
+{SEPARATOR}
+
+Estimated rework: *₹{{cost_impact_lakh:.1f}} Lakh*
+Alert ID: {{alert_ref}}
+
+{THIN_SEP}
+⛔ *RECOMMENDATION:* Stop work and verify.
+{THIN_SEP}
+
+_Reply /resolve {{alert_ref}} if this is incorrect._
+"""
+    
+    _DOCUMENT_PROCESSED_TMPL = f"""
+{SEPARATOR}
+📄 *DOCUMENT PROCESSED*
+{SEPARATOR}
+
+✅ *{{document_name}}*
+📐 Specifications extracted: *{{specs_count}}*
+
+{THIN_SEP}
+🔍 *What I Found:*
+{THIN_SEP}
+
+{{preview_text}}{{more_text}}
+
+{SEPARATOR}
+🧠 *These specs are now active.*
+{SEPARATOR}
+
+Every site photo will be cross-referenced.
+Every question will cite this document.
+
+_Try: "What does this drawing say about [element]?"_
+"""
+    
+    _VALUE_REPORT_TMPL = f"""
+{SEPARATOR}
+📊 *SITEMIND VALUE REPORT*
+   {{company_name}}
+   {{period}}
+{SEPARATOR}
+
+💰 *VALUE PROTECTED*
+{THIN_SEP}
+   Mismatches Caught: {{mismatches_caught}}
+   Value Saved: *₹{{value_protected_lakh:.1f}} Lakh*
+   ROI: *{{roi:.0f}}x* your subscription
+
+📐 *PROJECT INTELLIGENCE*
+{THIN_SEP}
+   Specifications Stored: {{specs_stored}}
+   Photos Analyzed: {{photos_analyzed}}
+   Questions Answered: {{questions_answered}}
+
+{SEPARATOR}
+💡 *Every photo cross-referenced.*
+   *Every mismatch caught early.*
+{SEPARATOR}
+
+_Full report: sitemind.ai/dashboard_
+"""
+    
+    _ALL_CLEAR_MSG = f"""
+{SEPARATOR}
+✅ *ALL CLEAR*
+{SEPARATOR}
+
+No open mismatch alerts.
+All photos verified against specs.
+
+_Keep sending photos for continuous verification._
+"""
+    
+    _ALERT_SUMMARY_TMPL = f"""
+{SEPARATOR}
+🚨 *{{open_alerts}} OPEN ALERTS*
+{SEPARATOR}
+
+💰 Total value at risk: *₹{{total_value_at_risk:.1f}} Lakh*
+
+{THIN_SEP}
+*Priority Issues:*
+{{alerts_text}}
+
+{SEPARATOR}
+View all: sitemind.ai/dashboard/alerts
+{SEPARATOR}
+"""
+    
+    _HELP_TMPL = f"""
+{SEPARATOR}
+🧠 *SITEMIND - Your Project Brain*
+{SEPARATOR}
+
+Hi {{user_name}}! Here's what I can do:
+
+*SEND ME:*
+   📷 *Photos* → Cross-referenced against specs
+   📄 *Documents* → Specs extracted automatically
+   💬 *Questions* → Answered with citations
+   📝 *Updates* → Stored in project memory
+
+*COMMANDS:*
+   /project  → Switch between projects
+   /specs    → View stored specifications
+   /alerts   → View mismatch alerts
+   /report   → Get value protected report
+   /search   → Search project memory
+   /help     → Show this message
+
+{THIN_SEP}
+Current Project: *{{project_name}}*
+{THIN_SEP}
+
+_Just send a message to get started._
+"""
+    
+    _ERROR_TMPL = f"""
+{SEPARATOR}
+⚠️ *Unable to Process*
+{SEPARATOR}
+
+{{error_type}}{{detail_text}}
+
+Please try again, or reply with your question
+and I'll do my best to help.
+
+{THIN_SEP}
+_Need help? Just describe what you need._
+"""
+    
+    _TEAM_MEMBER_ADDED_TMPL = f"""
+{SEPARATOR}
+👥 *TEAM MEMBER ADDED*
+{SEPARATOR}
+
+*{{member_name}}* has been added to
+*{{company_name}}* by {{added_by}}.
+
+They can now:
+   • Send questions and get answers
+   • Upload photos for verification
+   • Access all project information
+
+{THIN_SEP}
+_Team management: sitemind.ai/dashboard/team_
+"""
+    
     # =========================================================================
     # AI RESPONSE - Questions
     # =========================================================================
@@ -63,16 +266,11 @@ class MessageTemplates:
 📎 *Sources:*
 {chr(10).join(citation_lines)}"""
         
-        return f"""
-{MessageTemplates.SEPARATOR}
-💬 *{project_name or 'Project'}*
-{MessageTemplates.SEPARATOR}
-
-{answer}{citation_section}
-
-{MessageTemplates.THIN_SEP}
-_Ask follow-up questions anytime._
-"""
+        return MessageTemplates._AI_ANSWER_TMPL.format_map({
+            "project_name": project_name or "Project",
+            "answer": answer,
+            "citation_section": citation_section,
+        })
     
     # =========================================================================
     # PHOTO ANALYSIS
@@ -86,23 +284,14 @@ _Ask follow-up questions anytime._
     ) -> str:
         """Photo matches specifications"""
         
-        specs_text = "\n".join([f"   ✓ {s}" for s in specs_verified[:5]])
+        specs_text = "\n".join(f"   ✓ {s}" for s in specs_verified[:5])
         location_text = f"\n📍 *Location:* {location}" if location else ""
         
-        return f"""
-{MessageTemplates.SEPARATOR}
-✅ *PHOTO VERIFIED*
-{MessageTemplates.SEPARATOR}
-
-{analysis}{location_text}
-
-{MessageTemplates.THIN_SEP}
-📐 *Verified Against:*
-{specs_text}
-
-{MessageTemplates.SEPARATOR}
-_Photo stored in project memory._
-"""
+        return MessageTemplates._PHOTO_MATCH_TMPL.format_map({
+            "analysis": analysis,
+            "location_text": location_text,
+            "specs_text": specs_text,
+        })
     
     @staticmethod
     def format_photo_mismatch(
@@ -115,34 +304,14 @@ _Photo stored in project memory._
     ) -> str:
         """Photo has mismatch - THE HIGH VALUE MOMENT"""
         
-        return f"""
-{MessageTemplates.SEPARATOR}
-🚨 *MISMATCH DETECTED*
-{MessageTemplates.SEPARATOR}
-
-{analysis}
-
-{MessageTemplates.THIN_SEP}
-⚠️ *Discrepancy Found:*
-{MessageTemplates.THIN_SEP}
-
-📷 *What I see:* {detected}
-📐 *What spec says:* {expected}
-📄 *Source:* {source_doc}
-
-{MessageTemplates.SEPARATOR}
-💰 *COST IF NOT FIXED*
-{MessageTemplates.SEPARATOR}
-
-Estimated rework: *₹{cost_impact_lakh:.1f} Lakh*
-Alert ID: {alert_id[:8]}
-
-{MessageTemplates.THIN_SEP}
-⛔ *RECOMMENDATION:* Stop work and verify.
-{MessageTemplates.THIN_SEP}
-
-_Reply /resolve {alert_id[:8]} if this is incorrect._
-"""
+        return MessageTemplates._PHOTO_MISMATCH_TMPL.format_map({
+            "analysis": analysis,
+            "detected": detected,
+            "expected": expected,
+            "source_doc": source_doc,
+            "cost_impact_lakh": cost_impact_lakh,
+            "alert_ref": alert_id[:8],
+        })
     
     # =========================================================================
     # DOCUMENT PROCESSING
@@ -157,38 +326,18 @@ _Reply /resolve {alert_id[:8]} if this is incorrect._
         """Document uploaded and specs extracted"""
         
         # Format spec preview
-        preview_lines = []
-        for spec in specs_preview[:6]:
-            element = spec.get("element", "Item")
-            location = spec.get("location", "")
-            preview_lines.append(f"   • {element} @ {location}")
-        
-        preview_text = "\n".join(preview_lines)
+        preview_text = "\n".join(
+            f"   • {spec.get('element', 'Item')} @ {spec.get('location', '')}"
+            for spec in specs_preview[:6]
+        )
         more_text = f"\n   _...and {specs_count - 6} more_" if specs_count > 6 else ""
         
-        return f"""
-{MessageTemplates.SEPARATOR}
-📄 *DOCUMENT PROCESSED*
-{MessageTemplates.SEPARATOR}
-
-✅ *{document_name}*
-📐 Specifications extracted: *{specs_count}*
-
-{MessageTemplates.THIN_SEP}
-🔍 *What I Found:*
-{MessageTemplates.THIN_SEP}
-
-{preview_text}{more_text}
-
-{MessageTemplates.SEPARATOR}
-🧠 *These specs are now active.*
-{MessageTemplates.SEPARATOR}
-
-Every site photo will be cross-referenced.
-Every question will cite this document.
-
-_Try: "What does this drawing say about [element]?"_
-"""
+        return MessageTemplates._DOCUMENT_PROCESSED_TMPL.format_map({
+            "document_name": document_name,
+            "specs_count": specs_count,
+            "preview_text": preview_text,
+            "more_text": more_text,
+        })
     
     # =========================================================================
     # VALUE REPORTS
@@ -207,35 +356,18 @@ _Try: "What does this drawing say about [element]?"_
         """Weekly/Monthly value report"""
         
         # Calculate ROI
-        subscription_lakh = 0.83  # ₹83,000
-        roi = value_protected_lakh / subscription_lakh if subscription_lakh > 0 else 0
+        roi = value_protected_lakh / SUBSCRIPTION_LAKH
         
-        return f"""
-{MessageTemplates.SEPARATOR}
-📊 *SITEMIND VALUE REPORT*
-   {company_name}
-   {period}
-{MessageTemplates.SEPARATOR}
-
-💰 *VALUE PROTECTED*
-{MessageTemplates.THIN_SEP}
-   Mismatches Caught: {mismatches_caught}
-   Value Saved: *₹{value_protected_lakh:.1f} Lakh*
-   ROI: *{roi:.0f}x* your subscription
-
-📐 *PROJECT INTELLIGENCE*
-{MessageTemplates.THIN_SEP}
-   Specifications Stored: {specs_stored}
-   Photos Analyzed: {photos_analyzed}
-   Questions Answered: {questions_answered}
-
-{MessageTemplates.SEPARATOR}
-💡 *Every photo cross-referenced.*
-   *Every mismatch caught early.*
-{MessageTemplates.SEPARATOR}
-
-_Full report: sitemind.ai/dashboard_
-"""
+        return MessageTemplates._VALUE_REPORT_TMPL.format_map({
+            "company_name": company_name,
+            "period": period,
+            "mismatches_caught": mismatches_caught,
+            "value_protected_lakh": value_protected_lakh,
+            "roi": roi,
+            "specs_stored": specs_stored,
+            "photos_analyzed": photos_analyzed,
+            "questions_answered": questions_answered,
+        })
     
     # =========================================================================
     # ALERTS
@@ -250,41 +382,19 @@ _Full report: sitemind.ai/dashboard_
         """Summary of open alerts"""
         
         if open_alerts == 0:
-            return f"""
-{MessageTemplates.SEPARATOR}
-✅ *ALL CLEAR*
-{MessageTemplates.SEPARATOR}
-
-No open mismatch alerts.
-All photos verified against specs.
-
-_Keep sending photos for continuous verification._
-"""
+            return MessageTemplates._ALL_CLEAR_MSG
         
         # Format critical alerts
-        alert_lines = []
-        for alert in critical_alerts[:3]:
-            severity = "🔴" if alert.get("severity") == "critical" else "🟠"
-            desc = alert.get("description", "")[:40]
-            alert_lines.append(f"   {severity} {desc}...")
-        
-        alerts_text = "\n".join(alert_lines)
+        alerts_text = "\n".join(
+            f"   {_SEVERITY_ICONS.get(alert.get('severity'), '🟠')} {alert.get('description', '')[:40]}..."
+            for alert in critical_alerts[:3]
+        )
         
-        return f"""
-{MessageTemplates.SEPARATOR}
-🚨 *{open_alerts} OPEN ALERTS*
-{MessageTemplates.SEPARATOR}
-
-💰 Total value at risk: *₹{total_value_at_risk:.1f} Lakh*
-
-{MessageTemplates.THIN_SEP}
-*Priority Issues:*
-{alerts_text}
-
-{MessageTemplates.SEPARATOR}
-View all: sitemind.ai/dashboard/alerts
-{MessageTemplates.SEPARATOR}
-"""
+        return MessageTemplates._ALERT_SUMMARY_TMPL.format_map({
+            "open_alerts": open_alerts,
+            "total_value_at_risk": total_value_at_risk,
+            "alerts_text": alerts_text,
+        })
     
     # =========================================================================
     # COMMANDS
@@ -294,33 +404,10 @@ View all: sitemind.ai/dashboard/alerts
     def format_help(user_name: str, project_name: str) -> str:
         """Help message - professional and clear"""
         
-        return f"""
-{MessageTemplates.SEPARATOR}
-🧠 *SITEMIND - Your Project Brain*
-{MessageTemplates.SEPARATOR}
-
-Hi {user_name}! Here's what I can do:
-
-*SEND ME:*
-   📷 *Photos* → Cross-referenced against specs
-   📄 *Documents* → Specs extracted automatically
-   💬 *Questions* → Answered with citations
-   📝 *Updates* → Stored in project memory
-
-*COMMANDS:*
-   /project  → Switch between projects
-   /specs    → View stored specifications
-   /alerts   → View mismatch alerts
-   /report   → Get value protected report
-   /search   → Search project memory
-   /help     → Show this message
-
-{MessageTemplates.THIN_SEP}
-Current Project: *{project_name}*
-{MessageTemplates.THIN_SEP}
-
-_Just send a message to get started._
-"""
+        return MessageTemplates._HELP_TMPL.format_map({
+            "user_name": user_name,
+            "project_name": project_name,
+        })
     
     # =========================================================================
     # ERRORS - Even errors should feel professional
@@ -332,19 +419,10 @@ _Just send a message to get started._
         
         detail_text = f"\n_{details}_" if details else ""
         
-        return f"""
-{MessageTemplates.SEPARATOR}
-⚠️ *Unable to Process*
-{MessageTemplates.SEPARATOR}
-
-{error_type}{detail_text}
-
-Please try again, or reply with your question
-and I'll do my best to help.
-
-{MessageTemplates.THIN_SEP}
-_Need help? Just describe what you need._
-"""
+        return MessageTemplates._ERROR_TMPL.format_map({
+            "error_type": error_type,
+            "detail_text": detail_text,
+        })
     
     # =========================================================================
     # TEAM NOTIFICATIONS
@@ -358,22 +436,11 @@ _Need help? Just describe what you need._
     ) -> str:
         """Notification when team member is added"""
         
-        return f"""
-{MessageTemplates.SEPARATOR}
-👥 *TEAM MEMBER ADDED*
-{MessageTemplates.SEPARATOR}
-
-*{member_name}* has been added to
-*{company_name}* by {added_by}.
-
-They can now:
-   • Send questions and get answers
-   • Upload photos for verification
-   • Access all project information
-
-{MessageTemplates.THIN_SEP}
-_Team management: sitemind.ai/dashboard/team_
-"""
+        return MessageTemplates._TEAM_MEMBER_ADDED_TMPL.format_map({
+            "member_name": member_name,
+            "added_by": added_by,
+            "company_name": company_name,
+        })
 
 
 # Export singleton-style access
@@ -9,12 +9,50 @@ FEATURES:
 - Daily status sync
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, List, Set, DefaultDict, Deque
+from collections import defaultdict, deque
+from itertools import islice
 from datetime import datetime
 from dataclasses import dataclass
+from functools import lru_cache
+import sys
+import time
 
 
-@dataclass
+# Updates kept per project; older ones age out (with their acks) as new ones arrive
+UPDATES_PER_PROJECT_MAX = 10_000
+
+# Update type -> notification icon
+_UPDATE_ICONS: Dict[str, str] = {
+    "drawing": "📐",
+    "change_order": "📝",
+    "rfi": "❓",
+    "announcement": "📢",
+    "site_report": "📋",
+}
+
+# WhatsApp notification for a sync update, filled with format_map
+_UPDATE_NOTIFICATION_TMPL = """{icon} **{title}**
+
+{content}
+
+From: {from_user} ({from_location})
+Time: {time}
+
+_Reply 'ack' to acknowledge._"""
+
+
+@lru_cache(maxsize=1)
+def _utc_iso_for_second(second: int) -> str:
+    return datetime.utcfromtimestamp(second).isoformat()
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as ISO-8601 at second precision, formatted once per second"""
+    return _utc_iso_for_second(int(time.time()))
+
+
+@dataclass(slots=True)
 class SyncUpdate:
     id: str
     project_id: str
@@ -33,8 +71,13 @@ class OfficeSiteSyncService:
     """
     
     def __init__(self):
-        self._updates: Dict[str, List[SyncUpdate]] = {}  # project_id -> updates
-        self._pending_acks: Dict[str, List[str]] = {}  # update_id -> user_phones pending
+        self._updates: DefaultDict[str, Deque[SyncUpdate]] = defaultdict(
+            lambda: deque(maxlen=UPDATES_PER_PROJECT_MAX)
+        )  # project_id -> updates, oldest first
+        self._pending_acks: Dict[str, Dict[str, None]] = {}  # update_id -> user_phones pending (ordered)
+        self._updates_by_id: Dict[str, SyncUpdate] = {}  # update_id -> update
+        self._acked_by_phone: DefaultDict[str, Set[str]] = defaultdict(set)  # user_phone -> acknowledged update_ids
+        self._notifications: Dict[str, str] = {}  # update_id -> rendered WhatsApp text
     
     # =========================================================================
     # UPDATES
@@ -52,47 +95,64 @@ class OfficeSiteSyncService:
     ) -> SyncUpdate:
         """Broadcast an update to all team members"""
         update = SyncUpdate(
-            id=f"sync_{datetime.utcnow().timestamp():.0f}",
+            id=f"sync_{time.time_ns()}",
             project_id=project_id,
             update_type=update_type,
             title=title,
             content=content,
             from_user=from_user,
             from_location=from_location,
-            created_at=datetime.utcnow().isoformat(),
+            created_at=_utc_now_iso(),
             acknowledged_by=[],
         )
         
-        if project_id not in self._updates:
-            self._updates[project_id] = []
-        self._updates[project_id].append(update)
+        updates = self._updates[project_id]
+        if len(updates) == UPDATES_PER_PROJECT_MAX:
+            self._forget_update(updates[0])
+        updates.append(update)
+        self._updates_by_id[update.id] = update
         
         if required_acks:
-            self._pending_acks[update.id] = required_acks.copy()
+            # Dedup while keeping the caller's order, so notifications go out deterministically
+            self._pending_acks[update.id] = dict.fromkeys(map(sys.intern, required_acks))
         
         return update
     
+    def _forget_update(self, update: SyncUpdate):
+        """Drop an update aged out of its project's history from every index"""
+        self._updates_by_id.pop(update.id, None)
+        self._pending_acks.pop(update.id, None)
+        self._notifications.pop(update.id, None)
+        for phone in update.acknowledged_by:
+            acked = self._acked_by_phone.get(phone)
+            if acked is not None:
+                acked.discard(update.id)
+                if not acked:
+                    del self._acked_by_phone[phone]
+    
     def acknowledge_update(
         self,
         update_id: str,
         user_phone: str,
     ) -> bool:
         """Acknowledge receipt of an update"""
-        # Find the update
-        for updates in self._updates.values():
-            for update in updates:
-                if update.id == update_id:
-                    if user_phone not in update.acknowledged_by:
-                        update.acknowledged_by.append(user_phone)
-                    
-                    # Remove from pending
-                    if update_id in self._pending_acks:
-                        if user_phone in self._pending_acks[update_id]:
-                            self._pending_acks[update_id].remove(user_phone)
-                    
-                    return True
+        update = self._updates_by_id.get(update_id)
+        if update is None:
+            return False
+        
+        # Phones repeat across every update and index; share one string object
+        user_phone = sys.intern(user_phone)
+        acked = self._acked_by_phone[user_phone]
+        if update_id not in acked:
+            acked.add(update_id)
+            update.acknowledged_by.append(user_phone)
         
-        return False
+        # Remove from pending
+        pending = self._pending_acks.get(update_id)
+        if pending:
+            pending.pop(user_phone, None)
+        
+        return True
     
     # =========================================================================
     # SPECIFIC UPDATE TYPES
@@ -158,68 +218,67 @@ class OfficeSiteSyncService:
     ) -> List[SyncUpdate]:
         """Get updates not yet acknowledged by user"""
         updates = self._updates.get(project_id, [])
+        acked = self._acked_by_phone.get(user_phone, ())
         
-        pending = [
-            u for u in updates 
-            if user_phone not in u.acknowledged_by
+        # Updates are appended in creation order, so newest first is a reversed walk
+        return [
+            u for u in reversed(updates)
+            if u.id not in acked
         ]
-        
-        return sorted(pending, key=lambda x: x.created_at, reverse=True)
     
     def get_pending_acknowledgments(
         self,
         update_id: str,
     ) -> List[str]:
         """Get list of users who haven't acknowledged"""
-        return self._pending_acks.get(update_id, [])
+        return list(self._pending_acks.get(update_id, ()))
     
     def format_update_notification(self, update: SyncUpdate) -> str:
-        """Format update for WhatsApp notification"""
-        icons = {
-            "drawing": "📐",
-            "change_order": "📝",
-            "rfi": "❓",
-            "announcement": "📢",
-            "site_report": "📋",
-        }
+        """Format update for WhatsApp notification (rendered once per update)"""
+        cached = self._notifications.get(update.id)
+        if cached is not None:
+            return cached
         
-        icon = icons.get(update.update_type, "ℹ️")
+        icon = _UPDATE_ICONS.get(update.update_type, "ℹ️")
         
-        return f"""{icon} **{update.title}**
-
-{update.content}
-
-From: {update.from_user} ({update.from_location})
-Time: {update.created_at[:16]}
-
-_Reply 'ack' to acknowledge._"""
+        text = self._notifications[update.id] = _UPDATE_NOTIFICATION_TMPL.format_map({
+            "icon": icon,
+            "title": update.title,
+            "content": update.content,
+            "from_user": update.from_user,
+            "from_location": update.from_location,
+            "time": update.created_at[:16],
+        })
+        return text
     
     def get_sync_status(self, project_id: str) -> str:
         """Get sync status for project"""
-        updates = self._updates.get(project_id, [])
+        updates = self._updates.get(project_id)
+        if not updates:
+            return "No sync updates yet."
+        
+        # Last 10 updates, oldest first (read from the tail, not the whole history)
+        last_10 = list(islice(reversed(updates), 10))[::-1]
         
         # Count unacknowledged
         total_unack = sum(
-            len(self._pending_acks.get(u.id, [])) 
-            for u in updates[-10:]  # Last 10 updates
+            len(self._pending_acks.get(u.id, ()))
+            for u in last_10
         )
         
-        recent = updates[-5:] if updates else []
+        recent = last_10[-5:]
         
-        if not updates:
-            return "No sync updates yet."
-        
-        status = f"**Sync Status**\n\n"
-        status += f"• Recent updates: {len(recent)}\n"
-        status += f"• Pending acknowledgments: {total_unack}\n\n"
+        parts = [
+            "**Sync Status**\n\n",
+            f"• Recent updates: {len(recent)}\n",
+            f"• Pending acknowledgments: {total_unack}\n\n",
+            "**Recent:**\n",
+        ]
         
-        if recent:
-            status += "**Recent:**\n"
-            for u in recent[:3]:
-                ack_count = len(u.acknowledged_by)
-                status += f"• {u.title[:30]}... ({ack_count} acks)\n"
+        for u in recent[:3]:
+            parts.append(f"• {u.title[:30]}... ({len(u.acknowledged_by)} acks)\n")
         
-        return status
+        return "".join(parts)
 
 
 # Singleton instance
@@ -14,14 +14,142 @@ This ensures:
 4. All decisions are visible to both sides
 """
 
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Set, DefaultDict
+from collections import defaultdict
+from datetime import date, datetime, timedelta
 from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+import asyncio
+import json
+import time
 
+from config import settings
 from utils.logger import logger
 
+# orjson is much faster for the activity journal; stdlib json keeps dev boxes working.
+try:
+    import orjson
+    
+    def _json_dumpb(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumpb(obj: Any) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+    
+    _json_loads = json.loads
+
+# Weekly report totals; kept per company per day as activity is tracked
+_TOTAL_KEYS = ("queries", "photos", "documents", "change_orders", "safety_flags", "billable_items")
+
+# Days of activity kept in memory (weekly reports need the last 7)
+ACTIVITY_RETENTION_DAYS = 14
+
+# Every tracked event is appended to a per-day JSONL journal, replayed on startup
+# (restore_activity) so a restart doesn't wipe the day's activity before the
+# evening summary
+ACTIVITY_JOURNAL_DIR = Path(settings.LOCAL_STATE_DIR) / ".office_sync_cache"
+
+# Queries shown in (and kept for) the evening summary
+TOP_QUERIES_MAX = 5
+
+# Prefixes for change orders / safety flags in the day's decision and issue lists
+_CHANGE_PREFIX = "Change: "
+_SAFETY_PREFIX = "⚠️ Safety: "
+
+# Evening summary status -> (icon, status message)
+_STATUS = {
+    "critical": ("🔴", "⚠️ Safety issues detected - immediate attention required"),
+    "attention": ("🟡", "🟡 Items need your approval or review"),
+    "normal": ("🟢", "✅ Normal day - no critical issues"),
+}
+_UNKNOWN_STATUS = ("📊", "")
+
+# Fixed pieces of the WhatsApp summaries
+_DIVIDER = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+# Evening summary: header (filled with format_map), attention lines in display
+# order, and list sections as (summary key, heading, show "... and N more")
+_EVENING_HEADER_TMPL = f"""{{icon}} *Evening Summary: {{project_name}}*
+📅 {{date}}
+
+{_DIVIDER}
+
+📊 *Today's Activity:*
+• Queries: {{total_queries}}
+• Photos: {{photos_uploaded}}
+• Documents: {{documents_uploaded}}
+• Active Users: {{active_users}}
+
+"""
+_ATTENTION_LINES = (
+    ("safety_flags", "• ⚠️ Safety Flags: {}\n"),
+    ("change_orders", "• 📝 New Change Orders: {}\n"),
+    ("issues", "• ❗ Issues Reported: {}\n"),
+    ("alerts", "• 🔔 Alerts: {}\n"),
+)
+_EVENING_LIST_SECTIONS = (
+    ("billable_work", "💰 *Billable Work:*\n", True),
+    ("decisions_made", "✅ *Decisions Made:*\n", True),
+    ("issues_reported", "⚠️ *Issues Reported:*\n", False),
+)
+
+_MORNING_HEADER_TMPL = """☀️ *Good Morning! {project_name}*
+📅 {day}
+
+"""
+
+_MORNING_REMINDERS = """💡 *Quick Reminders:*
+• Document all changes with photos
+• Log any extra work for billing
+• Report safety issues immediately
+• Ask SiteMind before uncertain decisions
+
+_Reply with any questions. Have a productive day!_ 🏗️"""
+
+_WEEKLY_REPORT_TMPL = f"""📊 *Weekly Report*
+📅 {{period}}
+
+{_DIVIDER}
+
+*Activity Summary:*
+• Total Queries: {{queries}}
+• Photos Analyzed: {{photos}}
+• Documents Uploaded: {{documents}}
+
+*Items Tracked:*
+• Change Orders: {{change_orders}}
+• Safety Flags: {{safety_flags}}
+• Billable Items: {{billable_items}}
+
+{_DIVIDER}
+
+_Full report available on dashboard._"""
+
+
+@lru_cache(maxsize=1)
+def _utc_date_for_day(epoch_day: int) -> str:
+    return datetime.utcfromtimestamp(epoch_day * 86400).strftime("%Y-%m-%d")
+
+
+def _utc_today() -> str:
+    """Today's UTC date (YYYY-MM-DD), formatted once per day"""
+    return _utc_date_for_day(int(time.time()) // 86400)
+
 
-@dataclass
+@lru_cache(maxsize=1)
+def _utc_iso_for_second(second: int) -> str:
+    return datetime.utcfromtimestamp(second).isoformat()
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as ISO-8601 at second precision, formatted once per second"""
+    return _utc_iso_for_second(int(time.time()))
+
+
+@dataclass(slots=True, kw_only=True)
 class DailyActivity:
     """Track daily site activity"""
     date: str
@@ -49,7 +177,68 @@ class DailyActivity:
     billable_items: List[str] = field(default_factory=list)
     
     # Active Users
-    active_users: List[str] = field(default_factory=list)
+    active_users: Set[str] = field(default_factory=set)
+    
+    # Bumped by every applied event; keys the formatted evening summary cache
+    version: int = 0
+
+
+def _apply_query(activity: DailyActivity, text: str, user_id: Optional[str]):
+    activity.total_queries += 1
+    # Summaries only show the day's first few queries; don't store the rest
+    if len(activity.queries_list) < TOP_QUERIES_MAX:
+        activity.queries_list.append(text[:100])
+    activity.active_users.add(user_id)
+
+
+def _apply_photo(activity: DailyActivity, text: str, user_id: Optional[str]):
+    activity.photos_uploaded += 1
+    activity.active_users.add(user_id)
+
+
+def _apply_document(activity: DailyActivity, text: str, user_id: Optional[str]):
+    activity.documents_uploaded += 1
+    activity.active_users.add(user_id)
+
+
+def _apply_change_order(activity: DailyActivity, text: str, user_id: Optional[str]):
+    activity.change_orders_created += 1
+    activity.decisions_made.append(_CHANGE_PREFIX + text[:50])
+
+
+def _apply_decision(activity: DailyActivity, text: str, user_id: Optional[str]):
+    activity.decisions_made.append(text[:100])
+
+
+def _apply_safety_flag(activity: DailyActivity, text: str, user_id: Optional[str]):
+    activity.safety_flags += 1
+    activity.issues_reported.append(_SAFETY_PREFIX + text[:50])
+
+
+def _apply_issue(activity: DailyActivity, text: str, user_id: Optional[str]):
+    activity.issues_reported.append(text[:100])
+
+
+def _apply_billable(activity: DailyActivity, text: str, user_id: Optional[str]):
+    activity.billable_items.append(text[:100])
+
+
+def _apply_alert(activity: DailyActivity, text: str, user_id: Optional[str]):
+    activity.alerts_raised += 1
+
+
+# Tracked event kind -> (update to its DailyActivity, weekly total it counts towards)
+_EVENTS = {
+    "query": (_apply_query, "queries"),
+    "photo": (_apply_photo, "photos"),
+    "document": (_apply_document, "documents"),
+    "change_order": (_apply_change_order, "change_orders"),
+    "decision": (_apply_decision, None),
+    "safety_flag": (_apply_safety_flag, "safety_flags"),
+    "issue": (_apply_issue, None),
+    "billable": (_apply_billable, "billable_items"),
+    "alert": (_apply_alert, None),
+}
 
 
 class OfficeSyncService:
@@ -61,8 +250,29 @@ class OfficeSyncService:
         # Daily activity tracking
         self._daily_activity: Dict[str, DailyActivity] = {}  # key: date_projectId
         
+        # Same activities indexed company_id -> date -> project_id, for reports
+        self._by_company: DefaultDict[str, DefaultDict[str, Dict[str, DailyActivity]]] = defaultdict(
+            lambda: defaultdict(dict)
+        )
+        
+        # Running report totals: company_id -> date -> {total key: count}
+        self._daily_totals: DefaultDict[str, Dict[str, Dict[str, int]]] = defaultdict(dict)
+        
+        # Formatted evening summaries: (date, project_id) -> (activity version,
+        # project_name, text), reused across office contacts until the
+        # project's activity changes
+        self._summary_text: Dict[tuple, tuple] = {}
+        
+        # Day the retention window was last applied (see _evict_old_activity)
+        self._current_day = ""
+        
         # PM/Admin contacts for each company
         self._office_contacts: Dict[str, List[str]] = {}  # company_id -> list of phones
+        
+        # Journal lines not yet written (date -> [encoded lines]), and the task
+        # writing them out in a worker thread
+        self._journal_pending: Dict[str, List[bytes]] = {}
+        self._journal_flush: Optional[asyncio.Task] = None
     
     # =========================================================================
     # ACTIVITY TRACKING
@@ -70,17 +280,210 @@ class OfficeSyncService:
     
     def _get_activity(self, project_id: str, company_id: str) -> DailyActivity:
         """Get or create today's activity tracker"""
-        today = datetime.utcnow().strftime("%Y-%m-%d")
-        key = f"{today}_{project_id}"
+        today = _utc_today()
+        if today != self._current_day:
+            self._evict_old_activity(today)
+        return self._activity_for(today, project_id, company_id)
+    
+    def _activity_for(self, day: str, project_id: str, company_id: str) -> DailyActivity:
+        """Get or create the activity tracker for a project on a given day"""
+        key = f"{day}_{project_id}"
         
-        if key not in self._daily_activity:
-            self._daily_activity[key] = DailyActivity(
-                date=today,
+        activity = self._daily_activity.get(key)
+        if activity is None:
+            activity = self._daily_activity[key] = DailyActivity(
+                date=day,
                 project_id=project_id,
                 company_id=company_id,
             )
+            self._by_company[company_id][day][project_id] = activity
+        
+        return activity
+    
+    def _peek_activity(self, project_id: str) -> DailyActivity:
+        """Today's activity tracker, or an empty one that isn't stored"""
+        activity = self._daily_activity.get(f"{_utc_today()}_{project_id}")
+        if activity is None:
+            return DailyActivity(date="", project_id=project_id, company_id="")
+        return activity
+    
+    def _evict_old_activity(self, today: str):
+        """Once per day, drop tracked activity older than ACTIVITY_RETENTION_DAYS"""
+        self._current_day = today
+        cutoff = (
+            date.fromisoformat(today) - timedelta(days=ACTIVITY_RETENTION_DAYS)
+        ).isoformat()
+        
+        # ISO dates compare chronologically as strings
+        for key in [k for k, a in self._daily_activity.items() if a.date < cutoff]:
+            del self._daily_activity[key]
+        for key in [k for k in self._summary_text if k[0] < cutoff]:
+            del self._summary_text[key]
+        for by_date in (*self._by_company.values(), *self._daily_totals.values()):
+            for day in [d for d in by_date if d < cutoff]:
+                del by_date[day]
         
-        return self._daily_activity[key]
+        if ACTIVITY_JOURNAL_DIR.is_dir():
+            for path in ACTIVITY_JOURNAL_DIR.glob("*.jsonl"):
+                if path.stem < cutoff:
+                    path.unlink(missing_ok=True)
+    
+    def _bump_totals(self, activity: DailyActivity, total_key: str):
+        """Count one tracked event towards its company's daily report totals"""
+        by_date = self._daily_totals[activity.company_id]
+        totals = by_date.get(activity.date)
+        if totals is None:
+            totals = by_date[activity.date] = dict.fromkeys(_TOTAL_KEYS, 0)
+        totals[total_key] += 1
+    
+    def _track(
+        self,
+        kind: str,
+        project_id: str,
+        company_id: str,
+        text: str = "",
+        user_id: Optional[str] = None,
+    ):
+        """Apply a tracked event to today's activity and journal it"""
+        activity = self._get_activity(project_id, company_id)
+        self._apply_event(activity, kind, text, user_id)
+        self._journal_events(activity, [(kind, text, user_id)])
+    
+    def _apply_event(self, activity: DailyActivity, kind: str, text: str, user_id: Optional[str]):
+        """Update an activity tracker (and report totals) for one event"""
+        apply, total_key = _EVENTS[kind]
+        apply(activity, text or "", user_id)
+        activity.version += 1
+        self._summary_text.pop((activity.date, activity.project_id), None)
+        if total_key is not None:
+            self._bump_totals(activity, total_key)
+    
+    def _journal_events(self, activity: DailyActivity, events: List[tuple]):
+        """Queue (kind, text, user_id) events for their day's JSONL journal"""
+        self._journal_pending.setdefault(activity.date, []).append(b"".join(
+            _json_dumpb({
+                "kind": kind,
+                "project_id": activity.project_id,
+                "company_id": activity.company_id,
+                "text": (text or "")[:100],
+                "user_id": user_id,
+            })
+            for kind, text, user_id in events
+        ))
+        
+        if self._journal_flush is not None:
+            return  # the running flush picks these up
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts, tests) - nothing to block, write now
+            self._write_journal(self._take_journal_pending())
+            return
+        self._journal_flush = loop.create_task(self._flush_journal())
+    
+    def _take_journal_pending(self) -> Dict[str, List[bytes]]:
+        pending, self._journal_pending = self._journal_pending, {}
+        return pending
+    
+    async def _flush_journal(self):
+        """Write queued journal lines in a worker thread until the queue is empty"""
+        try:
+            while self._journal_pending:
+                await asyncio.to_thread(self._write_journal, self._take_journal_pending())
+        finally:
+            self._journal_flush = None
+    
+    def _write_journal(self, pending: Dict[str, List[bytes]]):
+        """Append queued lines to their day files, one write per day"""
+        try:
+            ACTIVITY_JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.error(f"Office sync journal error: {e}")
+            return
+        for day, chunks in pending.items():
+            try:
+                with open(ACTIVITY_JOURNAL_DIR / f"{day}.jsonl", "ab") as f:
+                    f.write(b"".join(chunks))
+            except OSError as e:
+                logger.error(f"Office sync journal error ({day}): {e}")
+    
+    async def flush_journal(self):
+        """Wait until every tracked event is in the journal (call on shutdown)"""
+        if self._journal_flush is not None:
+            await self._journal_flush
+        if self._journal_pending:
+            await asyncio.to_thread(self._write_journal, self._take_journal_pending())
+    
+    def restore_activity(self):
+        """
+        Replay the retained days' journals after a restart
+        
+        Call once from the app's startup hook, before anything is tracked.
+        """
+        if not ACTIVITY_JOURNAL_DIR.is_dir():
+            return
+        
+        today = _utc_today()
+        self._evict_old_activity(today)
+        
+        restored = 0
+        for path in sorted(ACTIVITY_JOURNAL_DIR.glob("*.jsonl")):
+            day = path.stem
+            try:
+                with open(path, "rb") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        event = _json_loads(line)
+                        activity = self._activity_for(day, event["project_id"], event["company_id"])
+                        self._apply_event(activity, event["kind"], event["text"], event["user_id"])
+                        restored += 1
+            except Exception as e:
+                logger.error(f"Office sync journal read error ({path.name}): {e}")
+        
+        if restored:
+            logger.info(f"💾 Replayed {restored} office sync events from {ACTIVITY_JOURNAL_DIR}")
+    
+    def track_batch(
+        self,
+        project_id: str,
+        company_id: str,
+        *,
+        user_id: Optional[str] = None,
+        queries: List[str] = (),
+        photos: int = 0,
+        documents: int = 0,
+        change_orders: List[str] = (),
+        decisions: List[str] = (),
+        safety: List[str] = (),
+        issues: List[str] = (),
+        billable: List[str] = (),
+        alerts: int = 0,
+    ):
+        """
+        Track several events from one request at once
+        
+        Same effect as the matching track_* calls, with a single activity
+        lookup and a single journal write.
+        """
+        events = [
+            *(("query", q, user_id) for q in queries),
+            *(("photo", "", user_id) for _ in range(photos)),
+            *(("document", "", user_id) for _ in range(documents)),
+            *(("change_order", d, None) for d in change_orders),
+            *(("decision", d, None) for d in decisions),
+            *(("safety_flag", i, None) for i in safety),
+            *(("issue", i, None) for i in issues),
+            *(("billable", b, None) for b in billable),
+            *(("alert", "", None) for _ in range(alerts)),
+        ]
+        if not events:
+            return
+        
+        activity = self._get_activity(project_id, company_id)
+        for kind, text, event_user in events:
+            self._apply_event(activity, kind, text, event_user)
+        self._journal_events(activity, events)
     
     def track_query(
         self,
@@ -90,12 +493,7 @@ class OfficeSyncService:
         user_id: str,
     ):
         """Track a query from site"""
-        activity = self._get_activity(project_id, company_id)
-        activity.total_queries += 1
-        activity.queries_list.append(question[:100])
-        
-        if user_id not in activity.active_users:
-            activity.active_users.append(user_id)
+        self._track("query", project_id, company_id, question, user_id)
     
     def track_photo(
         self,
@@ -105,11 +503,7 @@ class OfficeSyncService:
         user_id: str,
     ):
         """Track photo upload"""
-        activity = self._get_activity(project_id, company_id)
-        activity.photos_uploaded += 1
-        
-        if user_id not in activity.active_users:
-            activity.active_users.append(user_id)
+        self._track("photo", project_id, company_id, caption, user_id)
     
     def track_document(
         self,
@@ -119,11 +513,7 @@ class OfficeSyncService:
         user_id: str,
     ):
         """Track document upload"""
-        activity = self._get_activity(project_id, company_id)
-        activity.documents_uploaded += 1
-        
-        if user_id not in activity.active_users:
-            activity.active_users.append(user_id)
+        self._track("document", project_id, company_id, doc_name, user_id)
     
     def track_change_order(
         self,
@@ -132,9 +522,7 @@ class OfficeSyncService:
         description: str,
     ):
         """Track change order creation"""
-        activity = self._get_activity(project_id, company_id)
-        activity.change_orders_created += 1
-        activity.decisions_made.append(f"Change: {description[:50]}")
+        self._track("change_order", project_id, company_id, description)
     
     def track_decision(
         self,
@@ -143,8 +531,7 @@ class OfficeSyncService:
         decision: str,
     ):
         """Track a decision made"""
-        activity = self._get_activity(project_id, company_id)
-        activity.decisions_made.append(decision[:100])
+        self._track("decision", project_id, company_id, decision)
     
     def track_safety_flag(
         self,
@@ -153,9 +540,7 @@ class OfficeSyncService:
         issue: str,
     ):
         """Track safety issue"""
-        activity = self._get_activity(project_id, company_id)
-        activity.safety_flags += 1
-        activity.issues_reported.append(f"⚠️ Safety: {issue[:50]}")
+        self._track("safety_flag", project_id, company_id, issue)
     
     def track_issue(
         self,
@@ -164,8 +549,7 @@ class OfficeSyncService:
         issue: str,
     ):
         """Track reported issue"""
-        activity = self._get_activity(project_id, company_id)
-        activity.issues_reported.append(issue[:100])
+        self._track("issue", project_id, company_id, issue)
     
     def track_billable(
         self,
@@ -174,8 +558,7 @@ class OfficeSyncService:
         description: str,
     ):
         """Track billable work item"""
-        activity = self._get_activity(project_id, company_id)
-        activity.billable_items.append(description[:100])
+        self._track("billable", project_id, company_id, description)
     
     def track_alert(
         self,
@@ -183,8 +566,7 @@ class OfficeSyncService:
         company_id: str,
     ):
         """Track alert raised"""
-        activity = self._get_activity(project_id, company_id)
-        activity.alerts_raised += 1
+        self._track("alert", project_id, company_id)
     
     # =========================================================================
     # DAILY SUMMARIES
@@ -201,14 +583,15 @@ class OfficeSyncService:
         
         This is the "what happened today" report
         """
-        activity = self._get_activity(project_id, company_id)
+        activity = self._peek_activity(project_id)
         
         summary = {
             "type": "evening_summary",
             "project_id": project_id,
             "project_name": project_name,
-            "date": activity.date,
-            "generated_at": datetime.utcnow().isoformat(),
+            "date": activity.date or _utc_today(),
+            "generated_at": _utc_now_iso(),
+            "activity_version": activity.version,
             
             "stats": {
                 "total_queries": activity.total_queries,
@@ -227,85 +610,61 @@ class OfficeSyncService:
             "billable_work": activity.billable_items,
             "decisions_made": activity.decisions_made,
             "issues_reported": activity.issues_reported,
-            "top_queries": activity.queries_list[:5],
+            "top_queries": activity.queries_list[:TOP_QUERIES_MAX],
         }
         
         # Status assessment
-        if activity.safety_flags > 0:
-            summary["status"] = "critical"
-            summary["status_message"] = "⚠️ Safety issues detected - immediate attention required"
-        elif activity.change_orders_created > 0 or activity.alerts_raised > 0:
-            summary["status"] = "attention"
-            summary["status_message"] = "🟡 Items need your approval or review"
-        else:
-            summary["status"] = "normal"
-            summary["status_message"] = "✅ Normal day - no critical issues"
+        status = (
+            "critical" if activity.safety_flags > 0
+            else "attention" if activity.change_orders_created > 0 or activity.alerts_raised > 0
+            else "normal"
+        )
+        summary["status"] = status
+        summary["status_message"] = _STATUS[status][1]
         
         return summary
     
     def format_evening_summary_whatsapp(self, summary: Dict) -> str:
         """Format evening summary for WhatsApp to office"""
+        # Only summaries from generate_evening_summary carry an activity version
+        cache_key = (summary["date"], summary["project_id"])
+        version = summary.get("activity_version")
+        cached = self._summary_text.get(cache_key)
+        if version is not None and cached is not None and cached[:2] == (version, summary["project_name"]):
+            return cached[2]
         
-        status_icons = {
-            "critical": "🔴",
-            "attention": "🟡",
-            "normal": "🟢",
-        }
-        
-        msg = f"""{status_icons.get(summary['status'], '📊')} *Evening Summary: {summary['project_name']}*
-📅 {summary['date']}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📊 *Today's Activity:*
-• Queries: {summary['stats']['total_queries']}
-• Photos: {summary['stats']['photos_uploaded']}
-• Documents: {summary['stats']['documents_uploaded']}
-• Active Users: {summary['stats']['active_users']}
-
-"""
+        parts = [_EVENING_HEADER_TMPL.format_map({
+            **summary["stats"],
+            "icon": _STATUS.get(summary["status"], _UNKNOWN_STATUS)[0],
+            "project_name": summary["project_name"],
+            "date": summary["date"],
+        })]
         
         # Attention items
         attention = summary['attention_needed']
         if any(v > 0 for v in attention.values()):
-            msg += "🚨 *Needs Attention:*\n"
-            if attention['safety_flags'] > 0:
-                msg += f"• ⚠️ Safety Flags: {attention['safety_flags']}\n"
-            if attention['change_orders'] > 0:
-                msg += f"• 📝 New Change Orders: {attention['change_orders']}\n"
-            if attention['issues'] > 0:
-                msg += f"• ❗ Issues Reported: {attention['issues']}\n"
-            if attention['alerts'] > 0:
-                msg += f"• 🔔 Alerts: {attention['alerts']}\n"
-            msg += "\n"
-        
-        # Billable work
-        if summary['billable_work']:
-            msg += "💰 *Billable Work:*\n"
-            for item in summary['billable_work'][:3]:
-                msg += f"• {item}\n"
-            if len(summary['billable_work']) > 3:
-                msg += f"_... and {len(summary['billable_work']) - 3} more_\n"
-            msg += "\n"
-        
-        # Decisions
-        if summary['decisions_made']:
-            msg += "✅ *Decisions Made:*\n"
-            for decision in summary['decisions_made'][:3]:
-                msg += f"• {decision}\n"
-            if len(summary['decisions_made']) > 3:
-                msg += f"_... and {len(summary['decisions_made']) - 3} more_\n"
-            msg += "\n"
-        
-        # Issues
-        if summary['issues_reported']:
-            msg += "⚠️ *Issues Reported:*\n"
-            for issue in summary['issues_reported'][:3]:
-                msg += f"• {issue}\n"
-            msg += "\n"
-        
-        msg += f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n{summary['status_message']}"
+            parts.append("🚨 *Needs Attention:*\n")
+            for key, line in _ATTENTION_LINES:
+                if attention[key] > 0:
+                    parts.append(line.format(attention[key]))
+            parts.append("\n")
+        
+        # Billable work, decisions, issues
+        for key, heading, show_more in _EVENING_LIST_SECTIONS:
+            items = summary[key]
+            if not items:
+                continue
+            parts.append(heading)
+            parts.extend(f"• {item}\n" for item in items[:3])
+            if show_more and len(items) > 3:
+                parts.append(f"_... and {len(items) - 3} more_\n")
+            parts.append("\n")
         
+        parts.append(f"{_DIVIDER}\n{summary['status_message']}")
+        msg = "".join(parts)
+        
+        if version is not None:
+            self._summary_text[cache_key] = (version, summary["project_name"], msg)
         return msg
     
     def generate_morning_brief(
@@ -323,30 +682,21 @@ class OfficeSyncService:
         
         now = datetime.utcnow()
         
-        msg = f"""☀️ *Good Morning! {project_name}*
-📅 {now.strftime("%A, %B %d")}
-
-"""
+        parts = [_MORNING_HEADER_TMPL.format(project_name=project_name, day=now.strftime("%A, %B %d"))]
         
         # Pending items from yesterday
         if pending_items:
             if pending_items.get("change_orders", 0) > 0:
-                msg += f"📝 *{pending_items['change_orders']} Change Order(s)* awaiting approval\n"
+                parts.append(f"📝 *{pending_items['change_orders']} Change Order(s)* awaiting approval\n")
             if pending_items.get("unbilled_items", 0) > 0:
-                msg += f"💰 *{pending_items['unbilled_items']} item(s)* need to be billed\n"
+                parts.append(f"💰 *{pending_items['unbilled_items']} item(s)* need to be billed\n")
             if pending_items.get("alerts", 0) > 0:
-                msg += f"🚨 *{pending_items['alerts']} alert(s)* need attention\n"
-            msg += "\n"
+                parts.append(f"🚨 *{pending_items['alerts']} alert(s)* need attention\n")
+            parts.append("\n")
         
-        msg += """💡 *Quick Reminders:*
-• Document all changes with photos
-• Log any extra work for billing
-• Report safety issues immediately
-• Ask SiteMind before uncertain decisions
-
-_Reply with any questions. Have a productive day!_ 🏗️"""
+        parts.append(_MORNING_REMINDERS)
         
-        return msg
+        return "".join(parts)
     
     # =========================================================================
     # WEEKLY REPORT
@@ -369,35 +719,43 @@ _Reply with any questions. Have a productive day!_ 🏗️"""
             "period": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
             "generated_at": end_date.isoformat(),
             "projects": [],
-            "totals": {
-                "queries": 0,
-                "photos": 0,
-                "documents": 0,
-                "change_orders": 0,
-                "safety_flags": 0,
-                "billable_items": 0,
-            },
+            "totals": dict.fromkeys(_TOTAL_KEYS, 0),
         }
         
-        # Aggregate from daily activities
-        for key, activity in self._daily_activity.items():
-            if activity.company_id != company_id:
-                continue
-            
-            # Check date range
-            activity_date = datetime.strptime(activity.date, "%Y-%m-%d")
-            if activity_date < start_date or activity_date > end_date:
-                continue
-            
-            if project_ids and activity.project_id not in project_ids:
+        # Days whose midnight falls in [start_date, end_date]; ISO date strings
+        # are looked up directly in the date-keyed indexes, never parsed
+        days = []
+        day = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day >= start_date:
+            days.append(day.date().isoformat())
+            day -= timedelta(days=1)
+        
+        totals = report["totals"]
+        
+        # Whole company: add up the running daily totals
+        if not project_ids:
+            company_totals = self._daily_totals.get(company_id, {})
+            for day in days:
+                day_totals = company_totals.get(day)
+                if day_totals:
+                    for total_key, count in day_totals.items():
+                        totals[total_key] += count
+            return report
+        
+        # Selected projects: aggregate their daily activities for those days only
+        by_date = self._by_company.get(company_id, {})
+        for day in days:
+            by_project = by_date.get(day)
+            if not by_project:
                 continue
             
-            report["totals"]["queries"] += activity.total_queries
-            report["totals"]["photos"] += activity.photos_uploaded
-            report["totals"]["documents"] += activity.documents_uploaded
-            report["totals"]["change_orders"] += activity.change_orders_created
-            report["totals"]["safety_flags"] += activity.safety_flags
-            report["totals"]["billable_items"] += len(activity.billable_items)
+            for activity in (by_project[p] for p in set(project_ids) if p in by_project):
+                totals["queries"] += activity.total_queries
+                totals["photos"] += activity.photos_uploaded
+                totals["documents"] += activity.documents_uploaded
+                totals["change_orders"] += activity.change_orders_created
+                totals["safety_flags"] += activity.safety_flags
+                totals["billable_items"] += len(activity.billable_items)
         
         return report
     
@@ -406,24 +764,7 @@ _Reply with any questions. Have a productive day!_ 🏗️"""
         
         totals = report["totals"]
         
-        return f"""📊 *Weekly Report*
-📅 {report['period']}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-*Activity Summary:*
-• Total Queries: {totals['queries']}
-• Photos Analyzed: {totals['photos']}
-• Documents Uploaded: {totals['documents']}
-
-*Items Tracked:*
-• Change Orders: {totals['change_orders']}
-• Safety Flags: {totals['safety_flags']}
-• Billable Items: {totals['billable_items']}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-_Full report available on dashboard._"""
+        return _WEEKLY_REPORT_TMPL.format(period=report["period"], **totals)
     
     # =========================================================================
     # OFFICE CONTACT MANAGEMENT
@@ -442,6 +783,27 @@ _Full report available on dashboard._"""
     def get_office_contacts(self, company_id: str) -> List[Dict]:
         """Get office contacts for a company"""
         return self._office_contacts.get(company_id, [])
+    
+    async def send_to_office(self, company_id: str, message: str) -> List[Dict[str, Any]]:
+        """Send a summary/report to all of a company's office contacts concurrently"""
+        from services.whatsapp_service import whatsapp_service
+        
+        contacts = self.get_office_contacts(company_id)
+        results = await asyncio.gather(
+            *(whatsapp_service.send_message(c["phone"], message) for c in contacts),
+            return_exceptions=True,
+        )
+        
+        for contact, result in zip(contacts, results):
+            if isinstance(result, Exception):
+                logger.error(f"Office summary to {contact['phone']} failed: {result}")
+            elif result.get("status") == "error":
+                logger.error(f"Office summary to {contact['phone']} failed: {result.get('error')}")
+        
+        return [
+            {"status": "error", "error": str(r)} if isinstance(r, Exception) else r
+            for r in results
+        ]
 
 
 # Singleton instance
@@ -17,7 +17,9 @@ TIMELINE:
 Every interaction should feel: INTELLIGENT, PROFESSIONAL, VALUABLE
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Deque, Tuple
+from collections import deque
+from itertools import islice
 from datetime import datetime
 from dataclasses import dataclass, field
 
@@ -27,7 +29,120 @@ from services.whatsapp_service import whatsapp_service
 from utils.logger import logger
 
 
-@dataclass
+# Most recent completed onboardings kept for progress/analytics
+COMPLETED_ONBOARDINGS_MAX = 1000
+
+# Onboarding steps, one bit each in OnboardingState.steps_done
+STEP_WELCOME = 1 << 0
+STEP_FIRST_DRAWING = 1 << 1
+STEP_FIRST_QUESTION = 1 << 2
+STEP_FIRST_PHOTO = 1 << 3
+STEP_DASHBOARD = 1 << 4
+_ALL_STEPS = STEP_WELCOME | STEP_FIRST_DRAWING | STEP_FIRST_QUESTION | STEP_FIRST_PHOTO | STEP_DASHBOARD
+ONBOARDING_TOTAL_STEPS = _ALL_STEPS.bit_count()
+
+
+# Message templates (filled with str.format)
+_WELCOME_TEMPLATE = """
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🧠 *Welcome to SiteMind, {admin_name}!*
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Your Project Brain for *{company_name}* is now active.
+
+I'm an AI construction expert that will:
+✅ Remember every drawing, spec, and decision
+✅ Cross-reference site photos against specs
+✅ Catch expensive mistakes before they happen
+✅ Answer any question with citations
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+📋 *LET'S GET YOU SET UP (5 minutes)*
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+*Step 1:* Send me ONE structural drawing (PDF or photo)
+         I'll extract all the specs automatically.
+
+*Step 2:* Ask me any question about it
+         I'll answer with citations.
+
+*Step 3:* Send a site photo
+         I'll cross-reference against the specs.
+
+Ready? *Send your first drawing now* 📐
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_Your dedicated dashboard: sitemind.ai/dashboard_
+_Support: Direct reply here anytime_
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+_DRAWING_WOW_TEMPLATE = """
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+✅ *DRAWING PROCESSED*
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+📄 *{document_name}*
+
+🔍 *I found {spec_count} specifications:*
+
+{specs_text}{more_text}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🧠 *WHAT I CAN DO NOW:*
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+• Ask me: _"What's the column size at B2?"_
+• Ask me: _"Rebar for beam on floor 3?"_
+• Send a photo: _I'll verify against these specs_
+
+*Try it now!* Ask any question about this drawing.
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+_DASHBOARD_TEMPLATE = """
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+📊 *YOUR SITEMIND DASHBOARD*
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+🔗 *sitemind.ai/dashboard*
+
+*What you'll see:*
+• 📐 All {spec_count} specifications stored
+• 🔔 Mismatch alerts (if any)
+• 📈 Value protected over time
+• 📋 Audit trail of all decisions
+• 💰 Usage & billing
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🎉 *ONBOARDING COMPLETE!*
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Your Project Brain is ready for *{company_name}*.
+
+*What happens now:*
+1. Add your team (they just message this number)
+2. Upload more drawings for more coverage
+3. Every site photo gets cross-referenced
+4. Every question answered with citations
+
+*Need help?* Just reply here anytime.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_Thank you for choosing SiteMind._
+_We're excited to protect your projects._
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+
+def _format_details(details: Optional[Dict]) -> str:
+    """First three spec details as "key: value, ..." """
+    if not details:
+        return ""
+    return ", ".join(f"{k}: {v}" for k, v in islice(details.items(), 3))
+
+
+@dataclass(slots=True, kw_only=True)
 class OnboardingState:
     """Track onboarding progress for a company"""
     company_id: str
@@ -36,16 +151,43 @@ class OnboardingState:
     started_at: datetime = field(default_factory=datetime.utcnow)
     
     # Progress tracking
-    welcome_sent: bool = False
-    first_drawing_uploaded: bool = False
+    steps_done: int = 0  # STEP_* bits
     specs_extracted: int = 0
-    first_question_asked: bool = False
-    first_photo_analyzed: bool = False
-    dashboard_introduced: bool = False
     
     # Engagement
     total_messages: int = 0
     wow_moments: int = 0  # Times we impressed them
+    
+    def complete_step(self, step: int) -> bool:
+        """Mark a STEP_* done; True only the first time"""
+        if self.steps_done & step:
+            return False
+        self.steps_done |= step
+        return True
+    
+    @property
+    def steps_complete(self) -> int:
+        return self.steps_done.bit_count()
+    
+    @property
+    def welcome_sent(self) -> bool:
+        return bool(self.steps_done & STEP_WELCOME)
+    
+    @property
+    def first_drawing_uploaded(self) -> bool:
+        return bool(self.steps_done & STEP_FIRST_DRAWING)
+    
+    @property
+    def first_question_asked(self) -> bool:
+        return bool(self.steps_done & STEP_FIRST_QUESTION)
+    
+    @property
+    def first_photo_analyzed(self) -> bool:
+        return bool(self.steps_done & STEP_FIRST_PHOTO)
+    
+    @property
+    def dashboard_introduced(self) -> bool:
+        return bool(self.steps_done & STEP_DASHBOARD)
 
 
 class OnboardingService:
@@ -56,7 +198,10 @@ class OnboardingService:
     """
     
     def __init__(self):
-        self._states: Dict[str, OnboardingState] = {}
+        self._states: Dict[str, OnboardingState] = {}  # in progress only
+        
+        # Finished onboardings move here: (company_id, state), oldest dropped first
+        self._completed: Deque[Tuple[str, OnboardingState]] = deque(maxlen=COMPLETED_ONBOARDINGS_MAX)
     
     # =========================================================================
     # WELCOME - Minute 0-5
@@ -84,41 +229,9 @@ class OnboardingService:
         self._states[company_id] = state
         
         # THE WELCOME MESSAGE - Sets expectations HIGH
-        welcome = f"""
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🧠 *Welcome to SiteMind, {admin_name}!*
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Your Project Brain for *{company_name}* is now active.
-
-I'm an AI construction expert that will:
-✅ Remember every drawing, spec, and decision
-✅ Cross-reference site photos against specs
-✅ Catch expensive mistakes before they happen
-✅ Answer any question with citations
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📋 *LET'S GET YOU SET UP (5 minutes)*
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-*Step 1:* Send me ONE structural drawing (PDF or photo)
-         I'll extract all the specs automatically.
-
-*Step 2:* Ask me any question about it
-         I'll answer with citations.
-
-*Step 3:* Send a site photo
-         I'll cross-reference against the specs.
-
-Ready? *Send your first drawing now* 📐
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-_Your dedicated dashboard: sitemind.ai/dashboard_
-_Support: Direct reply here anytime_
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-"""
+        welcome = _WELCOME_TEMPLATE.format(admin_name=admin_name, company_name=company_name)
         
-        state.welcome_sent = True
+        state.complete_step(STEP_WELCOME)
         await whatsapp_service.send_message(admin_phone, welcome)
         
         logger.info(f"🎉 Onboarding started for {company_name}")
@@ -144,46 +257,25 @@ _Support: Direct reply here anytime_
         
         state = self._states.get(company_id)
         if state:
-            state.first_drawing_uploaded = True
+            state.complete_step(STEP_FIRST_DRAWING)
             state.specs_extracted = len(specs_extracted)
             state.wow_moments += 1
         
         # Format specs beautifully
-        specs_display = []
-        for i, spec in enumerate(specs_extracted[:8], 1):  # Show first 8
-            element = spec.get("element", "Unknown")
-            location = spec.get("location", "")
-            details = spec.get("details", {})
-            
-            detail_str = ", ".join(f"{k}: {v}" for k, v in list(details.items())[:3])
-            specs_display.append(f"   {i}. *{element}* @ {location}\n      _{detail_str}_")
-        
-        specs_text = "\n".join(specs_display)
+        specs_text = "\n".join(
+            f"   {i}. *{spec.get('element', 'Unknown')}* @ {spec.get('location', '')}\n"
+            f"      _{_format_details(spec.get('details'))}_"
+            for i, spec in enumerate(specs_extracted[:8], 1)  # Show first 8
+        )
         more_text = f"\n   _...and {len(specs_extracted) - 8} more_" if len(specs_extracted) > 8 else ""
         
         # THE WOW RESPONSE
-        response = f"""
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-✅ *DRAWING PROCESSED*
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📄 *{document_name}*
-
-🔍 *I found {len(specs_extracted)} specifications:*
-
-{specs_text}{more_text}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🧠 *WHAT I CAN DO NOW:*
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-• Ask me: _"What's the column size at B2?"_
-• Ask me: _"Rebar for beam on floor 3?"_
-• Send a photo: _I'll verify against these specs_
-
-*Try it now!* Ask any question about this drawing.
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-"""
+        response = _DRAWING_WOW_TEMPLATE.format(
+            document_name=document_name,
+            spec_count=len(specs_extracted),
+            specs_text=specs_text,
+            more_text=more_text,
+        )
         
         await whatsapp_service.send_message(phone, response)
         logger.info(f"🎯 First drawing WOW delivered: {len(specs_extracted)} specs")
@@ -209,8 +301,7 @@ _Support: Direct reply here anytime_
         """
         
         state = self._states.get(company_id)
-        if state and not state.first_question_asked:
-            state.first_question_asked = True
+        if state and state.complete_step(STEP_FIRST_QUESTION):
             state.wow_moments += 1
         
         # Format citations
@@ -257,8 +348,7 @@ Every answer is traceable. No guessing.
         """
         
         state = self._states.get(company_id)
-        if state and not state.first_photo_analyzed:
-            state.first_photo_analyzed = True
+        if state and state.complete_step(STEP_FIRST_PHOTO):
             state.wow_moments += 1
         
         if has_mismatch:
@@ -329,42 +419,14 @@ This verification is now on record.
         """
         
         state = self._states.get(company_id)
-        if state:
-            state.dashboard_introduced = True
+        if state and state.complete_step(STEP_DASHBOARD):
+            self._completed.append((company_id, state))
+            self._states.pop(company_id, None)
         
-        response = f"""
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📊 *YOUR SITEMIND DASHBOARD*
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🔗 *sitemind.ai/dashboard*
-
-*What you'll see:*
-• 📐 All {stats.get('specs', 0)} specifications stored
-• 🔔 Mismatch alerts (if any)
-• 📈 Value protected over time
-• 📋 Audit trail of all decisions
-• 💰 Usage & billing
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🎉 *ONBOARDING COMPLETE!*
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Your Project Brain is ready for *{company_name}*.
-
-*What happens now:*
-1. Add your team (they just message this number)
-2. Upload more drawings for more coverage
-3. Every site photo gets cross-referenced
-4. Every question answered with citations
-
-*Need help?* Just reply here anytime.
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-_Thank you for choosing SiteMind._
-_We're excited to protect your projects._
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-"""
+        response = _DASHBOARD_TEMPLATE.format(
+            spec_count=stats.get("specs", 0),
+            company_name=company_name,
+        )
         
         await whatsapp_service.send_message(phone, response)
         logger.info(f"🎓 Onboarding complete for {company_name}")
@@ -375,26 +437,27 @@ _We're excited to protect your projects._
     # HELPERS
     # =========================================================================
     
+    def _find_completed(self, company_id: str) -> Optional[OnboardingState]:
+        """Most recent completed onboarding for a company, if still retained"""
+        for completed_id, state in reversed(self._completed):
+            if completed_id == company_id:
+                return state
+        return None
+    
     def get_onboarding_progress(self, company_id: str) -> Dict[str, Any]:
         """Get onboarding progress for analytics"""
         
-        state = self._states.get(company_id)
+        state = self._states.get(company_id) or self._find_completed(company_id)
         if not state:
             return {"status": "not_started"}
         
-        steps_complete = sum([
-            state.welcome_sent,
-            state.first_drawing_uploaded,
-            state.first_question_asked,
-            state.first_photo_analyzed,
-            state.dashboard_introduced,
-        ])
+        steps_complete = state.steps_complete
         
         return {
             "status": "complete" if steps_complete >= 4 else "in_progress",
             "steps_complete": steps_complete,
-            "total_steps": 5,
-            "progress_percent": (steps_complete / 5) * 100,
+            "total_steps": ONBOARDING_TOTAL_STEPS,
+            "progress_percent": 100.0 * steps_complete / ONBOARDING_TOTAL_STEPS,
             "specs_extracted": state.specs_extracted,
             "wow_moments": state.wow_moments,
             "started_at": state.started_at.isoformat(),
@@ -10,23 +10,94 @@ FEATURES:
 - Welcome messages
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Iterator, Tuple
 from datetime import datetime
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
+from functools import lru_cache
+import asyncio
+import secrets
 
 from services.config_service import config_service
 from services.whatsapp_client import WhatsAppClient
 from utils.logger import logger
 
 
+# Welcome messages in flight at once when completing an onboarding
+# (WhatsAppClient still applies its own per-minute rate limit)
+WELCOME_SEND_CONCURRENCY = 10
+
+# Separators dropped from phone numbers, removed in one str.translate pass
+_PHONE_SEPARATORS = str.maketrans("", "", " -")
+
+
+def _ensure_country_code(phone: str) -> str:
+    """Prefix + / +91 unless the number already starts with +"""
+    if phone[:1] == "+":
+        return phone
+    return "+" + phone if phone[:2] == "91" else "+91" + phone
+
+
+def _new_id(prefix: str) -> str:
+    """Random id like "user_1a2b3c4d5e6f"; records created in the same instant never collide"""
+    return f"{prefix}_{secrets.token_hex(6)}"
+
+
+@lru_cache(maxsize=4096)
+def _normalize_phone(raw: str) -> str:
+    """Strip separators and add the country code; the same raw numbers keep coming back"""
+    return _ensure_country_code(raw.translate(_PHONE_SEPARATORS))
+
+
+@dataclass(slots=True, kw_only=True)
+class Organization:
+    id: str
+    name: str
+    gstin: Optional[str] = None
+    address: Optional[str] = None
+    plan: str = "professional"
+    created_at: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True, kw_only=True)
+class User:
+    id: str
+    organization_id: Optional[str]
+    name: str
+    phone: str
+    role: str
+    email: Optional[str] = None  # admins
+    project_id: Optional[str] = None  # team members
+    created_at: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True, kw_only=True)
+class Project:
+    id: str
+    organization_id: Optional[str]
+    name: str
+    location: Optional[str] = None
+    project_type: str = "residential"
+    status: str = "active"
+    created_at: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
 @dataclass
 class OnboardingSession:
     id: str
     organization_id: Optional[str] = None
     organization_name: Optional[str] = None
-    admin_user: Optional[Dict] = None
-    projects: List[Dict] = field(default_factory=list)
-    team_members: List[Dict] = field(default_factory=list)
+    admin_user: Optional[User] = None
+    projects: List[Project] = field(default_factory=list)
+    team_members: List[User] = field(default_factory=list)
     config: Dict = field(default_factory=dict)
     status: str = "started"
     created_at: str = ""
@@ -38,13 +109,41 @@ class OnboardingService:
     Handle customer onboarding
     """
     
+    __slots__ = (
+        "_sessions",
+        "_organizations",
+        "_projects",
+        "_users",
+        "_users_by_phone",
+        "_org_users_by_phone",
+        "_users_by_org",
+        "_projects_by_org",
+        "_project_members",
+        "_project_member_ids",
+        "whatsapp",
+        "_welcome_slots",
+    )
+    
     def __init__(self):
         self._sessions: Dict[str, OnboardingSession] = {}
-        self._organizations: Dict[str, Dict] = {}
-        self._projects: Dict[str, Dict] = {}
-        self._users: Dict[str, Dict] = {}
+        # Records are slotted dataclasses; the public API hands out to_dict() copies
+        self._organizations: Dict[str, Organization] = {}
+        self._projects: Dict[str, Project] = {}
+        self._users: Dict[str, User] = {}
+        self._users_by_phone: Dict[str, str] = {}  # formatted phone -> first user_id with it
+        # The same person may work for several organizations, so duplicates are per org
+        self._org_users_by_phone: Dict[Tuple[Optional[str], str], str] = {}  # (org_id, phone) -> user_id
+        
+        # Per-organization ids, in creation order, so org listings skip other tenants
+        self._users_by_org: Dict[str, List[str]] = {}  # org_id -> [user_ids]
+        self._projects_by_org: Dict[str, List[str]] = {}  # org_id -> [project_ids]
+        
+        # Team members per project, in insertion order, plus a set for membership checks
+        self._project_members: Dict[str, List[str]] = {}  # project_id -> [user_ids]
+        self._project_member_ids: Dict[str, Set[str]] = {}
         
         self.whatsapp = WhatsAppClient()
+        self._welcome_slots = asyncio.Semaphore(WELCOME_SEND_CONCURRENCY)
     
     # =========================================================================
     # SESSION MANAGEMENT
@@ -53,7 +152,7 @@ class OnboardingService:
     def start_session(self) -> OnboardingSession:
         """Start a new onboarding session"""
         session = OnboardingSession(
-            id=f"onb_{datetime.utcnow().timestamp():.0f}",
+            id=_new_id("onb"),
             created_at=datetime.utcnow().isoformat(),
         )
         self._sessions[session.id] = session
@@ -77,22 +176,23 @@ class OnboardingService:
         gstin: str = None,
         address: str = None,
         plan: str = "professional",
+        created_at: str = None,
     ) -> Dict[str, Any]:
         """Create organization in session"""
         session = self.get_session(session_id)
         if not session:
             return {"error": "Session not found"}
         
-        org_id = f"org_{datetime.utcnow().timestamp():.0f}"
+        org_id = _new_id("org")
         
-        org = {
-            "id": org_id,
-            "name": name,
-            "gstin": gstin,
-            "address": address,
-            "plan": plan,
-            "created_at": datetime.utcnow().isoformat(),
-        }
+        org = Organization(
+            id=org_id,
+            name=name,
+            gstin=gstin,
+            address=address,
+            plan=plan,
+            created_at=created_at or datetime.utcnow().isoformat(),
+        )
         
         session.organization_id = org_id
         session.organization_name = name
@@ -107,7 +207,7 @@ class OnboardingService:
         
         logger.info(f"🏢 Organization created: {name} ({org_id})")
         
-        return org
+        return org.to_dict()
     
     # =========================================================================
     # ADMIN USER
@@ -119,30 +219,31 @@ class OnboardingService:
         name: str,
         email: str,
         phone: str,
+        created_at: str = None,
     ) -> Dict[str, Any]:
         """Create admin user for organization"""
         session = self.get_session(session_id)
         if not session:
             return {"error": "Session not found"}
         
-        user_id = f"user_{datetime.utcnow().timestamp():.0f}"
+        user_id = _new_id("user")
         
-        user = {
-            "id": user_id,
-            "organization_id": session.organization_id,
-            "name": name,
-            "email": email,
-            "phone": self._format_phone(phone),
-            "role": "admin",
-            "created_at": datetime.utcnow().isoformat(),
-        }
+        user = User(
+            id=user_id,
+            organization_id=session.organization_id,
+            name=name,
+            email=email,
+            phone=self._format_phone(phone),
+            role="admin",
+            created_at=created_at or datetime.utcnow().isoformat(),
+        )
         
         session.admin_user = user
-        self._users[user_id] = user
+        self._store_user(user)
         
         logger.info(f"👤 Admin user created: {name} ({user_id})")
         
-        return user
+        return user.to_dict()
     
     # =========================================================================
     # PROJECTS
@@ -154,30 +255,33 @@ class OnboardingService:
         name: str,
         location: str = None,
         project_type: str = "residential",
+        created_at: str = None,
     ) -> Dict[str, Any]:
         """Add a project to the session"""
         session = self.get_session(session_id)
         if not session:
             return {"error": "Session not found"}
         
-        project_id = f"proj_{datetime.utcnow().timestamp():.0f}"
+        project_id = _new_id("proj")
         
-        project = {
-            "id": project_id,
-            "organization_id": session.organization_id,
-            "name": name,
-            "location": location,
-            "project_type": project_type,
-            "status": "active",
-            "created_at": datetime.utcnow().isoformat(),
-        }
+        project = Project(
+            id=project_id,
+            organization_id=session.organization_id,
+            name=name,
+            location=location,
+            project_type=project_type,
+            created_at=created_at or datetime.utcnow().isoformat(),
+        )
         
         session.projects.append(project)
+        self._projects_by_org.setdefault(session.organization_id, []).append(project_id)
         self._projects[project_id] = project
+        self._project_members[project_id] = []
+        self._project_member_ids[project_id] = set()
         
         logger.info(f"📁 Project added: {name} ({project_id})")
         
-        return project
+        return project.to_dict()
     
     # =========================================================================
     # TEAM MEMBERS
@@ -190,30 +294,104 @@ class OnboardingService:
         name: str,
         phone: str,
         role: str = "site_engineer",
+        created_at: str = None,
     ) -> Dict[str, Any]:
         """Add a team member"""
         session = self.get_session(session_id)
         if not session:
             return {"error": "Session not found"}
         
-        user_id = f"user_{datetime.utcnow().timestamp():.0f}"
-        
-        user = {
-            "id": user_id,
-            "organization_id": session.organization_id,
-            "project_id": project_id,
-            "name": name,
-            "phone": self._format_phone(phone),
-            "role": role,
-            "created_at": datetime.utcnow().isoformat(),
-        }
+        phone = self._format_phone(phone)
+        
+        # Same phone added twice in this org (e.g. repeated in a team list or on
+        # a second project) - keep one user and just add the project membership
+        existing_id = self._org_users_by_phone.get((session.organization_id, phone))
+        if existing_id is not None:
+            user = self._users[existing_id]
+            self._join_session(session, user)
+            self._add_project_member(project_id, existing_id)
+            logger.info(f"👤 Team member already exists: {phone}")
+            return user.to_dict()
+        
+        user_id = _new_id("user")
+        
+        user = User(
+            id=user_id,
+            organization_id=session.organization_id,
+            project_id=project_id,
+            name=name,
+            phone=phone,
+            role=role,
+            created_at=created_at or datetime.utcnow().isoformat(),
+        )
         
         session.team_members.append(user)
-        self._users[user_id] = user
+        self._store_user(user)
+        
+        self._add_project_member(project_id, user_id)
         
         logger.info(f"👤 Team member added: {name} as {role}")
         
-        return user
+        return user.to_dict()
+    
+    def add_team_members(
+        self,
+        session_id: str,
+        members: List[Dict],
+        project_id: str = None,
+        created_at: str = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Add several team members in one pass
+        
+        Members are {"name", "phone", "role"?, "project_id"?} (project_id
+        defaults to the one given here). Phones already registered in this
+        organization, or repeated in the list, return the existing user and
+        are added to the member's project.
+        """
+        session = self.get_session(session_id)
+        if not session:
+            return [{"error": "Session not found"}]
+        
+        created_at = created_at or datetime.utcnow().isoformat()
+        
+        # Classify first: existing users vs new ones (deduped within the batch)
+        results: List[User] = []
+        memberships: List[Tuple[str, str]] = []  # (project_id, user_id)
+        new_users: Dict[str, User] = {}  # phone -> user
+        for member in members:
+            phone = self._format_phone(member.get("phone"))
+            member_project_id = member.get("project_id", project_id)
+            existing_id = self._org_users_by_phone.get((session.organization_id, phone))
+            if existing_id is not None:
+                user = self._users[existing_id]
+                self._join_session(session, user)
+            else:
+                user = new_users.get(phone)
+                if user is None:
+                    user = new_users[phone] = User(
+                        id=_new_id("user"),
+                        organization_id=session.organization_id,
+                        project_id=member_project_id,
+                        name=member.get("name"),
+                        phone=phone,
+                        role=member.get("role", "site_engineer"),
+                        created_at=created_at,
+                    )
+            results.append(user)
+            memberships.append((member_project_id, user.id))
+        
+        # Then insert all new users at once
+        added = list(new_users.values())
+        session.team_members.extend(added)
+        for user in added:
+            self._store_user(user)
+        for member_project_id, user_id in memberships:
+            self._add_project_member(member_project_id, user_id)
+        
+        logger.info(f"👥 {len(added)} team members added ({len(results) - len(added)} already registered)")
+        
+        return [user.to_dict() for user in results]
     
     # =========================================================================
     # CONFIGURATION
@@ -254,33 +432,29 @@ class OnboardingService:
         result = {
             "organization_id": session.organization_id,
             "organization_name": session.organization_name,
-            "admin_user_id": session.admin_user["id"] if session.admin_user else None,
+            "admin_user_id": session.admin_user.id if session.admin_user else None,
             "project_count": len(session.projects),
             "team_member_count": len(session.team_members),
             "welcome_messages_sent": 0,
         }
         
-        # Send welcome messages
+        # Send welcome messages to the admin and team concurrently
         if send_welcome:
-            # Welcome admin
-            if session.admin_user:
-                await self._send_welcome(
-                    session.admin_user["phone"],
-                    session.admin_user["name"],
-                    "admin",
-                    session.organization_name,
-                )
-                result["welcome_messages_sent"] += 1
+            recipients = [(session.admin_user, "admin")] if session.admin_user else []
+            recipients.extend((member, member.role) for member in session.team_members)
+            sends = await asyncio.gather(
+                *(
+                    self._send_welcome(user.phone, user.name, role, session.organization_name)
+                    for user, role in recipients
+                ),
+                return_exceptions=True,
+            )
             
-            # Welcome team members
-            for member in session.team_members:
-                await self._send_welcome(
-                    member["phone"],
-                    member["name"],
-                    member["role"],
-                    session.organization_name,
-                )
-                result["welcome_messages_sent"] += 1
+            for (user, _), sent in zip(recipients, sends):
+                if isinstance(sent, Exception):
+                    logger.error(f"Welcome message to {user.phone} failed: {sent}")
+                else:
+                    result["welcome_messages_sent"] += 1
         
         logger.info(f"✅ Onboarding completed: {session.organization_name}")
         
@@ -306,11 +480,14 @@ class OnboardingService:
         # Start session
         session = self.start_session()
         
+        # Everything created in this setup shares the session's timestamp
+        created_at = session.created_at
+        
         # Create organization
-        self.create_organization(session.id, organization_name)
+        self.create_organization(session.id, organization_name, created_at=created_at)
         
         # Create admin
-        self.create_admin_user(session.id, admin_name, admin_email, admin_phone)
+        self.create_admin_user(session.id, admin_name, admin_email, admin_phone, created_at=created_at)
         
         # Add projects
         if projects:
@@ -320,19 +497,13 @@ class OnboardingService:
                     proj.get("name", "Main Project"),
                     proj.get("location"),
                     proj.get("type", "residential"),
+                    created_at=created_at,
                 )
         
         # Add team members
         if team_members:
-            project_id = session.projects[0]["id"] if session.projects else None
-            for member in team_members:
-                self.add_team_member(
-                    session.id,
-                    member.get("project_id", project_id),
-                    member.get("name"),
-                    member.get("phone"),
-                    member.get("role", "site_engineer"),
-                )
+            project_id = session.projects[0].id if session.projects else None
+            self.add_team_members(session.id, team_members, project_id, created_at=created_at)
         
         # Set config
         if config:
@@ -345,15 +516,32 @@ class OnboardingService:
     # HELPERS
     # =========================================================================
     
+    def _store_user(self, user: User):
+        """Save a user and update the phone and organization indexes"""
+        self._users[user.id] = user
+        self._users_by_phone.setdefault(user.phone, user.id)
+        self._org_users_by_phone.setdefault((user.organization_id, user.phone), user.id)
+        self._users_by_org.setdefault(user.organization_id, []).append(user.id)
+    
+    def _join_session(self, session: OnboardingSession, user: User):
+        """Include an existing user in this session's team (for the welcome message)"""
+        if user is session.admin_user or any(member is user for member in session.team_members):
+            return
+        session.team_members.append(user)
+    
+    def _add_project_member(self, project_id: str, user_id: str):
+        """Record a user as a project member (once)"""
+        member_ids = self._project_member_ids.setdefault(project_id, set())
+        if user_id not in member_ids:
+            member_ids.add(user_id)
+            self._project_members.setdefault(project_id, []).append(user_id)
+    
     def _format_phone(self, phone: str) -> str:
         """Format phone number"""
-        phone = phone.replace(" ", "").replace("-", "")
-        if not phone.startswith("+"):
-            if phone.startswith("91"):
-                phone = f"+{phone}"
-            else:
-                phone = f"+91{phone}"
-        return phone
+        # Already normalized (the common case for webhook lookups)
+        if phone[:1] == "+" and " " not in phone and "-" not in phone:
+            return phone
+        return _normalize_phone(phone)
     
     async def _send_welcome(
         self,
@@ -362,8 +550,9 @@ class OnboardingService:
         role: str,
         org_name: str,
     ):
-        """Send welcome message"""
-        await self.whatsapp.send_welcome(phone, name, role, org_name)
+        """Send welcome message (at most WELCOME_SEND_CONCURRENCY at a time)"""
+        async with self._welcome_slots:
+            await self.whatsapp.send_welcome(phone, name, role, org_name)
     
     # =========================================================================
     # LOOKUPS
@@ -371,43 +560,57 @@ class OnboardingService:
     
     def get_organization(self, org_id: str) -> Optional[Dict]:
         """Get organization by ID"""
-        return self._organizations.get(org_id)
+        org = self._organizations.get(org_id)
+        return org.to_dict() if org else None
     
     def get_project(self, project_id: str) -> Optional[Dict]:
         """Get project by ID"""
-        return self._projects.get(project_id)
+        project = self._projects.get(project_id)
+        return project.to_dict() if project else None
     
     def get_user(self, user_id: str) -> Optional[Dict]:
         """Get user by ID"""
-        return self._users.get(user_id)
+        user = self._users.get(user_id)
+        return user.to_dict() if user else None
     
     def get_user_by_phone(self, phone: str) -> Optional[Dict]:
         """Get user by phone number"""
-        phone_formatted = self._format_phone(phone)
-        for user in self._users.values():
-            if user.get("phone") == phone_formatted:
-                return user
-        return None
+        user_id = self._users_by_phone.get(self._format_phone(phone))
+        return self._users[user_id].to_dict() if user_id is not None else None
     
     def list_organizations(self) -> List[Dict]:
         """List all organizations"""
-        return list(self._organizations.values())
+        return [org.to_dict() for org in self._organizations.values()]
+    
+    def iter_projects(self, org_id: str = None) -> Iterator[Dict]:
+        """Yield projects one at a time, optionally filtered by org"""
+        if org_id:
+            projects = (self._projects[pid] for pid in self._projects_by_org.get(org_id, ()))
+        else:
+            projects = self._projects.values()
+        for project in projects:
+            yield project.to_dict()
     
     def list_projects(self, org_id: str = None) -> List[Dict]:
         """List projects, optionally filtered by org"""
-        projects = list(self._projects.values())
-        if org_id:
-            projects = [p for p in projects if p.get("organization_id") == org_id]
-        return projects
+        return list(self.iter_projects(org_id))
+    
+    def iter_users(self, org_id: str = None, project_id: str = None) -> Iterator[Dict]:
+        """Yield users one at a time, optionally filtered"""
+        if project_id:
+            users = (self._users[uid] for uid in self._project_members.get(project_id, ()))
+            if org_id:
+                users = (u for u in users if u.organization_id == org_id)
+        elif org_id:
+            users = (self._users[uid] for uid in self._users_by_org.get(org_id, ()))
+        else:
+            users = self._users.values()
+        for user in users:
+            yield user.to_dict()
     
     def list_users(self, org_id: str = None, project_id: str = None) -> List[Dict]:
         """List users, optionally filtered"""
-        users = list(self._users.values())
-        if org_id:
-            users = [u for u in users if u.get("organization_id") == org_id]
-        if project_id:
-            users = [u for u in users if u.get("project_id") == project_id]
-        return users
+        return list(self.iter_users(org_id, project_id))
 
 
 # Singleton instance
@@ -28,37 +28,11 @@ from services.whatsapp_service import whatsapp_service
 from utils.logger import logger
 
 
-@dataclass
-class OnboardingState:
-    """Track customer's onboarding progress"""
-    company_id: str
-    company_name: str
-    started_at: datetime
-    steps_completed: List[str]
-    first_spec_uploaded: bool = False
-    first_photo_analyzed: bool = False
-    first_question_answered: bool = False
-    first_mismatch_caught: bool = False
-    demo_value_shown: float = 0  # INR
+# Monthly subscription, for the ROI lines in the value messages
+MONTHLY_SUBSCRIPTION_INR = 83000
 
-
-class OnboardingWowService:
-    """
-    Create the $1000/month WOW experience in the first hour
-    """
-    
-    def __init__(self):
-        self._states: Dict[str, OnboardingState] = {}
-    
-    # =========================================================================
-    # WELCOME MESSAGES - Premium Feel
-    # =========================================================================
-    
-    def get_premium_welcome(self, company_name: str, user_name: str) -> str:
-        """
-        First message that sets the tone - THIS IS PREMIUM
-        """
-        return f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Message templates (filled with format_map)
+_PREMIUM_WELCOME_TMPL = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 🧠 *Welcome to SiteMind*
    _Your Project Brain_
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -90,11 +64,7 @@ Welcome to *{company_name}*'s dedicated AI construction assistant.
 
 _SiteMind: Zero information gaps. Zero money leaks._"""
 
-    def get_first_drawing_response(self, specs_count: int, drawing_name: str) -> str:
-        """
-        Response after first drawing uploaded - Show immediate value
-        """
-        return f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_FIRST_DRAWING_TMPL = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 📐 *Drawing Processed*
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -116,11 +86,7 @@ _SiteMind: Zero information gaps. Zero money leaks._"""
    Or send a site photo to verify against specs
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-    def get_first_question_response(self, question: str, answer: str, source: str) -> str:
-        """
-        First question answered - Demonstrate citation power
-        """
-        return f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_FIRST_QUESTION_TMPL = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 💬 *Your Question:*
 {question}
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -136,11 +102,7 @@ No more "who said that?" or "where's that from?"
 
 _Everything in SiteMind is traceable and citeable._"""
 
-    def get_photo_match_response(self, description: str) -> str:
-        """
-        Photo analyzed, matches specs - Show verification value
-        """
-        return f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_PHOTO_MATCH_TMPL = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 📷 *Photo Verified*
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -157,19 +119,7 @@ _Everything in SiteMind is traceable and citeable._"""
 _Every photo you send is automatically verified._
 _If something's wrong, SiteMind catches it._"""
 
-    def get_mismatch_caught_response(
-        self, 
-        description: str,
-        detected: str,
-        expected: str,
-        source: str,
-        cost_impact: float,
-    ) -> str:
-        """
-        THE MONEY MOMENT - First mismatch caught
-        This is where they realize the value
-        """
-        return f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_MISMATCH_CAUGHT_TMPL = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 🚨 *MISMATCH DETECTED*
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -182,18 +132,18 @@ _If something's wrong, SiteMind catches it._"""
 └─────────────────────────────────────┘
 
 ⚠️ *If not caught:*
-• Rework after concrete: ₹{cost_impact/100000:.1f} Lakh
+• Rework after concrete: ₹{cost_lakh:.1f} Lakh
 • Schedule delay: 1-2 weeks
 • Quality compromise risk
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 💰 *VALUE DELIVERED*
-   This ONE catch just saved ₹{cost_impact/100000:.1f} Lakh
+   This ONE catch just saved ₹{cost_lakh:.1f} Lakh
    
-   Your monthly subscription: ₹83,000
-   This single catch: ₹{cost_impact/100000:.1f} Lakh
+   Your monthly subscription: ₹{subscription:,}
+   This single catch: ₹{cost_lakh:.1f} Lakh
    
-   *ROI on this catch alone: {cost_impact/83000:.0f}x*
+   *ROI on this catch alone: {roi:.0f}x*
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 🛑 *RECOMMENDED ACTION:*
@@ -201,68 +151,52 @@ Stop work. Verify on site. Fix before pour.
 
 _SiteMind caught this. Your Project Brain is working._"""
 
-    # =========================================================================
-    # FIRST HOUR MILESTONES
-    # =========================================================================
-
-    def get_30_minute_checkin(self, company_name: str, stats: Dict) -> str:
-        """
-        30 minute check-in - Show progress
-        """
-        return f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_CHECKIN_30_MIN_TMPL = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 📊 *Your First 30 Minutes with SiteMind*
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 *{company_name}* Progress:
 
-📐 Specifications stored: {stats.get('specs', 0)}
-📷 Photos analyzed: {stats.get('photos', 0)}
-💬 Questions answered: {stats.get('queries', 0)}
-⚠️ Mismatches caught: {stats.get('alerts', 0)}
+📐 Specifications stored: {specs}
+📷 Photos analyzed: {photos}
+💬 Questions answered: {queries}
+⚠️ Mismatches caught: {alerts}
 
-💰 *Estimated Value Protected: ₹{stats.get('value_protected', 0)/100000:.1f} Lakh*
+💰 *Estimated Value Protected: ₹{value_lakh:.1f} Lakh*
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 *What's Next:*
 
-{"✅" if stats.get('specs', 0) > 0 else "⬜"} Upload project drawings
-{"✅" if stats.get('queries', 0) > 0 else "⬜"} Ask a construction question
-{"✅" if stats.get('photos', 0) > 0 else "⬜"} Send a site photo for verification
+{specs_box} Upload project drawings
+{queries_box} Ask a construction question
+{photos_box} Send a site photo for verification
 
 _The more you use SiteMind, the smarter it gets._"""
 
-    def get_first_hour_summary(self, company_name: str, stats: Dict) -> str:
-        """
-        First hour summary - The WOW moment
-        """
-        value = stats.get('value_protected', 0)
-        subscription = 83000  # INR
-        roi = value / subscription if value > 0 else 0
-        
-        return f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_FIRST_HOUR_SUMMARY_TMPL = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 🎯 *YOUR FIRST HOUR WITH SITEMIND*
    {company_name}
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 📊 *Activity:*
-├─ Drawings processed: {stats.get('documents', 0)}
-├─ Specifications stored: {stats.get('specs', 0)}
-├─ Photos analyzed: {stats.get('photos', 0)}
-├─ Questions answered: {stats.get('queries', 0)}
-└─ Mismatches detected: {stats.get('alerts', 0)}
+├─ Drawings processed: {documents}
+├─ Specifications stored: {specs}
+├─ Photos analyzed: {photos}
+├─ Questions answered: {queries}
+└─ Mismatches detected: {alerts}
 
 💰 *Value in First Hour:*
 ┌─────────────────────────────────────────────┐
 │                                             │
-│   Potential Rework Prevented: ₹{value/100000:.1f}L    
+│   Potential Rework Prevented: ₹{value_lakh:.1f}L    
 │   Monthly Subscription: ₹0.83L              │
 │                                             │
 │   *First Hour ROI: {roi:.0f}x*                  │
 │                                             │
 └─────────────────────────────────────────────┘
 
-{"🏆 *CONGRATULATIONS!*" if value > 0 else ""}
-{"SiteMind already paid for itself!" if roi > 1 else ""}
+{congrats}
+{paid_for_itself}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 *What Happens Next:*
@@ -277,6 +211,147 @@ Your team just got a 24/7 AI construction expert.
 _SiteMind: Your Project Brain is now active._
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
+_DEMO_LOADED_MSG = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🎬 *DEMO: SiteMind in Action*
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+I've loaded sample specifications:
+
+📐 *Column B2* (Floor 3)
+   450x450mm, 12T16, M30
+
+📐 *Beam B2-C2* (Floor 3)
+   300x600mm, 4T20 top, 3T16 bottom
+
+📐 *Slab* (Floor 3, Area A)
+   150mm thick, 10mm @ 150mm c/c
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+*Try these:*
+
+1️⃣ Ask: "What's the column size at B2?"
+2️⃣ Ask: "Rebar for beam B2-C2?"
+3️⃣ Ask: "Slab thickness on floor 3?"
+
+_I'll answer with exact citations._
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
+
+
+@dataclass
+class OnboardingState:
+    """Track customer's onboarding progress"""
+    company_id: str
+    company_name: str
+    started_at: datetime
+    steps_completed: List[str]
+    first_spec_uploaded: bool = False
+    first_photo_analyzed: bool = False
+    first_question_answered: bool = False
+    first_mismatch_caught: bool = False
+    demo_value_shown: float = 0  # INR
+
+
+class OnboardingWowService:
+    """
+    Create the $1000/month WOW experience in the first hour
+    """
+    
+    def __init__(self):
+        self._states: Dict[str, OnboardingState] = {}
+    
+    # =========================================================================
+    # WELCOME MESSAGES - Premium Feel
+    # =========================================================================
+    
+    def get_premium_welcome(self, company_name: str, user_name: str) -> str:
+        """
+        First message that sets the tone - THIS IS PREMIUM
+        """
+        return _PREMIUM_WELCOME_TMPL.format_map({"user_name": user_name, "company_name": company_name})
+
+    def get_first_drawing_response(self, specs_count: int, drawing_name: str) -> str:
+        """
+        Response after first drawing uploaded - Show immediate value
+        """
+        return _FIRST_DRAWING_TMPL.format_map({"drawing_name": drawing_name, "specs_count": specs_count})
+
+    def get_first_question_response(self, question: str, answer: str, source: str) -> str:
+        """
+        First question answered - Demonstrate citation power
+        """
+        return _FIRST_QUESTION_TMPL.format_map({"question": question, "answer": answer, "source": source})
+
+    def get_photo_match_response(self, description: str) -> str:
+        """
+        Photo analyzed, matches specs - Show verification value
+        """
+        return _PHOTO_MATCH_TMPL.format_map({"description": description})
+
+    def get_mismatch_caught_response(
+        self, 
+        description: str,
+        detected: str,
+        expected: str,
+        source: str,
+        cost_impact: float,
+    ) -> str:
+        """
+        THE MONEY MOMENT - First mismatch caught
+        This is where they realize the value
+        """
+        return _MISMATCH_CAUGHT_TMPL.format_map({
+            "description": description,
+            "detected": detected,
+            "expected": expected,
+            "source": source,
+            "cost_lakh": cost_impact / 100000,
+            "roi": cost_impact / MONTHLY_SUBSCRIPTION_INR,
+            "subscription": MONTHLY_SUBSCRIPTION_INR,
+        })
+
+    # =========================================================================
+    # FIRST HOUR MILESTONES
+    # =========================================================================
+
+    def get_30_minute_checkin(self, company_name: str, stats: Dict) -> str:
+        """
+        30 minute check-in - Show progress
+        """
+        specs = stats.get("specs", 0)
+        photos = stats.get("photos", 0)
+        queries = stats.get("queries", 0)
+        return _CHECKIN_30_MIN_TMPL.format_map({
+            "company_name": company_name,
+            "specs": specs,
+            "photos": photos,
+            "queries": queries,
+            "alerts": stats.get("alerts", 0),
+            "value_lakh": stats.get("value_protected", 0) / 100000,
+            "specs_box": "✅" if specs > 0 else "⬜",
+            "queries_box": "✅" if queries > 0 else "⬜",
+            "photos_box": "✅" if photos > 0 else "⬜",
+        })
+
+    def get_first_hour_summary(self, company_name: str, stats: Dict) -> str:
+        """
+        First hour summary - The WOW moment
+        """
+        value = stats.get('value_protected', 0)
+        roi = value / MONTHLY_SUBSCRIPTION_INR if value > 0 else 0
+        
+        return _FIRST_HOUR_SUMMARY_TMPL.format_map({
+            "company_name": company_name,
+            "documents": stats.get("documents", 0),
+            "specs": stats.get("specs", 0),
+            "photos": stats.get("photos", 0),
+            "queries": stats.get("queries", 0),
+            "alerts": stats.get("alerts", 0),
+            "value_lakh": value / 100000,
+            "roi": roi,
+            "congrats": "🏆 *CONGRATULATIONS!*" if value > 0 else "",
+            "paid_for_itself": "SiteMind already paid for itself!" if roi > 1 else "",
+        })
+
     # =========================================================================
     # DEMO SCENARIOS
     # =========================================================================
@@ -345,32 +420,7 @@ _SiteMind: Your Project Brain is now active._
             )
         
         # Step 2: Send demo summary
-        demo_msg = f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🎬 *DEMO: SiteMind in Action*
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-I've loaded sample specifications:
-
-📐 *Column B2* (Floor 3)
-   450x450mm, 12T16, M30
-
-📐 *Beam B2-C2* (Floor 3)
-   300x600mm, 4T20 top, 3T16 bottom
-
-📐 *Slab* (Floor 3, Area A)
-   150mm thick, 10mm @ 150mm c/c
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-*Try these:*
-
-1️⃣ Ask: "What's the column size at B2?"
-2️⃣ Ask: "Rebar for beam B2-C2?"
-3️⃣ Ask: "Slab thickness on floor 3?"
-
-_I'll answer with exact citations._
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
-        
-        await whatsapp_service.send_message(phone, demo_msg)
+        await whatsapp_service.send_message(phone, _DEMO_LOADED_MSG)
         
         logger.info(f"🎬 Demo scenario loaded for {company_id}")
 
@@ -25,6 +25,55 @@ from utils.logger import logger
 from services.config_service import config_service
 
 
+# Shared {"role": ...} configs for the known roles. config_service merges these
+# into its own per-user dicts and never keeps a reference, so they aren't mutated.
+_ROLE_CONFIGS = {
+    role: {"role": role}
+    for role in ("owner", "admin", "pm", "site_engineer", "consultant", "viewer", "store_keeper")
+}
+
+
+def _role_config(role: str) -> Dict[str, str]:
+    return _ROLE_CONFIGS.get(role) or {"role": role}
+
+
+# New member welcome messages (filled with format_map)
+_MANAGER_ROLES = frozenset(("owner", "admin", "pm"))
+
+_MANAGER_WELCOME = """Welcome to {assistant_name}, {name}! 👋
+
+You've been added as **{role_label}**.
+
+You can:
+• Ask any question about the project
+• Upload drawings and photos
+• Create and manage tasks
+• View reports and analytics
+
+**Quick commands:**
+• `list team` - See team members
+• `add team [name] [phone] [role]` - Add someone
+• Ask any project question!
+
+Try it now - send any question!"""
+
+_MEMBER_WELCOME = """Welcome to {assistant_name}, {name}! 👋
+
+You've been added to the project team.
+
+I can help you with:
+• Blueprint specifications
+• Rebar details
+• Material information
+• And any project questions!
+
+Just send your question - I respond instantly, 24/7.
+
+Example: "beam size B3 floor 2?"
+
+Try it now!"""  # site_engineer, consultant, viewer
+
+
 class TeamManagementService:
     """
     Self-service team management via WhatsApp
@@ -250,7 +299,7 @@ class TeamManagementService:
             self._users[user_id] = user
             
             # Set config based on role
-            config_service.set_user_config(user_id, {"role": role})
+            config_service.set_user_config(user_id, _role_config(role))
         
         # Add to project
         if project_id not in self._project_members:
@@ -419,7 +468,7 @@ class TeamManagementService:
         
         old_role = user.get("role", "site_engineer")
         user["role"] = new_role
-        config_service.set_user_config(user["id"], {"role": new_role})
+        config_service.set_user_config(user["id"], _role_config(new_role))
         
         logger.info(f"👤 Role changed via WhatsApp: {user['name']} {old_role} → {new_role}")
         
@@ -457,40 +506,12 @@ class TeamManagementService:
         branding = config_service.get_branding(organization_id)
         assistant_name = branding.get("assistant_name", "SiteMind")
         
-        if role in ["owner", "admin", "pm"]:
-            return f"""Welcome to {assistant_name}, {name}! 👋
-
-You've been added as **{self._format_role(role)}**.
-
-You can:
-• Ask any question about the project
-• Upload drawings and photos
-• Create and manage tasks
-• View reports and analytics
-
-**Quick commands:**
-• `list team` - See team members
-• `add team [name] [phone] [role]` - Add someone
-• Ask any project question!
-
-Try it now - send any question!"""
-        
-        else:  # site_engineer, consultant, viewer
-            return f"""Welcome to {assistant_name}, {name}! 👋
-
-You've been added to the project team.
-
-I can help you with:
-• Blueprint specifications
-• Rebar details
-• Material information
-• And any project questions!
-
-Just send your question - I respond instantly, 24/7.
-
-Example: "beam size B3 floor 2?"
-
-Try it now!"""
+        template = _MANAGER_WELCOME if role in _MANAGER_ROLES else _MEMBER_WELCOME
+        return template.format_map({
+            "assistant_name": assistant_name,
+            "name": name,
+            "role_label": self._format_role(role),
+        })
     
     # =========================================================================
     # HELP MESSAGE
@@ -20,6 +20,59 @@ from config import settings
 from utils.logger import logger
 
 
+# Welcome messages by role (filled with str.format); anyone else gets the engineer one
+_OWNER_WELCOME = """Welcome to SiteMind, {name}! 🎉
+
+You're now set up as {role} for {org_name}.
+
+Your team can send any construction query via WhatsApp and get instant, accurate answers.
+
+To get started:
+• Forward any drawing to this number
+• Ask any question about the project
+• Type 'help' for all commands
+
+Questions? Just reply here!"""
+
+_PM_WELCOME = """Welcome to SiteMind, {name}!
+
+You've been added as Project Manager for {org_name}.
+
+You can:
+• Ask any question about project specs
+• Upload documents and photos
+• Create and assign tasks
+• Manage team members
+
+Quick commands:
+• `list team` - See team members
+• `add team [name] [phone] [role]` - Add someone
+• `help` - All commands
+
+Try it now - send any question!"""
+
+_ENGINEER_WELCOME = """Welcome to SiteMind, {name}!
+
+You've been added to {org_name}'s project team.
+
+I can help you with:
+• Blueprint specifications ("beam size B3?")
+• Rebar details ("sariya at C4?")
+• Material info ("steel grade?")
+
+Just send your question - I respond 24/7!
+
+Type 'help' for all commands.
+
+Try it now: Send any question about the project!"""  # site_engineer, consultant, viewer
+
+_WELCOME_TEMPLATES = {
+    "owner": _OWNER_WELCOME,
+    "admin": _OWNER_WELCOME,
+    "pm": _PM_WELCOME,
+}
+
+
 class WhatsAppClient:
     """
     WhatsApp Business API client via Twilio
@@ -159,53 +212,8 @@ class WhatsAppClient:
     async def send_welcome(self, phone: str, name: str, role: str, org_name: str) -> Dict[str, Any]:
         """Send welcome message to new user"""
         
-        if role in ["owner", "admin"]:
-            message = f"""Welcome to SiteMind, {name}! 🎉
-
-You're now set up as {role} for {org_name}.
-
-Your team can send any construction query via WhatsApp and get instant, accurate answers.
-
-To get started:
-• Forward any drawing to this number
-• Ask any question about the project
-• Type 'help' for all commands
-
-Questions? Just reply here!"""
-        
-        elif role == "pm":
-            message = f"""Welcome to SiteMind, {name}!
-
-You've been added as Project Manager for {org_name}.
-
-You can:
-• Ask any question about project specs
-• Upload documents and photos
-• Create and assign tasks
-• Manage team members
-
-Quick commands:
-• `list team` - See team members
-• `add team [name] [phone] [role]` - Add someone
-• `help` - All commands
-
-Try it now - send any question!"""
-        
-        else:  # site_engineer, consultant, viewer
-            message = f"""Welcome to SiteMind, {name}!
-
-You've been added to {org_name}'s project team.
-
-I can help you with:
-• Blueprint specifications ("beam size B3?")
-• Rebar details ("sariya at C4?")
-• Material info ("steel grade?")
-
-Just send your question - I respond 24/7!
-
-Type 'help' for all commands.
-
-Try it now: Send any question about the project!"""
+        template = _WELCOME_TEMPLATES.get(role, _ENGINEER_WELCOME)
+        message = template.format(name=name, role=role, org_name=org_name)
         
         return await self.send_message(phone, message)
     
@@ -9,6 +9,8 @@ SETUP:
 """
 
 from typing import Dict, Any, Optional
+import asyncio
+
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 
@@ -85,7 +87,9 @@ class WhatsAppService:
             if media_url:
                 message_params["media_url"] = [media_url]
             
-            message = self.client.messages.create(**message_params)
+            # Twilio's client is blocking; run it off the event loop so
+            # concurrent sends (e.g. summary fan-out) actually overlap
+            message = await asyncio.to_thread(self.client.messages.create, **message_params)
             
             logger.info(f"📤 WhatsApp sent to {to}: {body[:50]}...")
             
@@ -0,0 +1,40 @@
+"""
+Shared test setup for the backend service tests
+"""
+
+import sys
+import types
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# whatsapp_service imports the Twilio SDK at module level. The tests never send
+# anything, so stand in a minimal twilio when the SDK isn't installed.
+try:
+    import twilio  # noqa: F401
+except ImportError:
+    class Client:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    class TwilioRestException(Exception):
+        pass
+
+    twilio = types.ModuleType("twilio")
+    twilio_rest = types.ModuleType("twilio.rest")
+    twilio_base = types.ModuleType("twilio.base")
+    twilio_exceptions = types.ModuleType("twilio.base.exceptions")
+
+    twilio_rest.Client = Client
+    twilio_exceptions.TwilioRestException = TwilioRestException
+    twilio.rest = twilio_rest
+    twilio.base = twilio_base
+    twilio_base.exceptions = twilio_exceptions
+
+    sys.modules.update({
+        "twilio": twilio,
+        "twilio.rest": twilio_rest,
+        "twilio.base": twilio_base,
+        "twilio.base.exceptions": twilio_exceptions,
+    })
@@ -0,0 +1,429 @@
+"""
+Memory service tests
+Local fallback storage: spill files, restore and keyword search
+"""
+
+import asyncio
+import importlib
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from services.memory_service import MemoryService
+
+# The services package exposes a lazy memory_service attribute, so fetch the module itself
+memory_module = importlib.import_module("services.memory_service")
+
+
+@pytest.fixture
+def spill_dir(tmp_path, monkeypatch):
+    """Point local spill files at a temp directory"""
+    path = tmp_path / "memory_cache"
+    monkeypatch.setattr(memory_module, "LOCAL_SPILL_DIR", path)
+    return path
+
+
+@pytest.fixture
+def service(spill_dir):
+    """Local-only service (no Supermemory client)"""
+    service = MemoryService()
+    service.client = None
+    return service
+
+
+class FakeSupermemory:
+    """Stand-in for the Supermemory SDK client; fails while .down is set"""
+    
+    def __init__(self):
+        self.down = False
+        self.added = []
+        self.search_calls = 0
+        self.search = SimpleNamespace(execute=self._execute)
+    
+    def add(self, content, container_tag):
+        if self.down:
+            raise ConnectionError("Supermemory unavailable")
+        self.added.append(content)
+        return SimpleNamespace(id=f"doc_{len(self.added)}")
+    
+    def _execute(self, container_tags, q, limit):
+        self.search_calls += 1
+        if self.down:
+            raise ConnectionError("Supermemory unavailable")
+        return SimpleNamespace(results=[
+            SimpleNamespace(
+                document_id=f"doc_{i + 1}",
+                chunks=[SimpleNamespace(content=content)],
+                content=content,
+                score=0.9,
+                title="",
+                created_at="",
+            )
+            for i, content in enumerate(self.added)
+        ])
+
+
+@pytest.fixture
+def remote(service):
+    """Service backed by a fake Supermemory client"""
+    service.client = FakeSupermemory()
+    return service
+
+
+def _spilled_contents(spill_dir, key="c1_p1"):
+    path = spill_dir / f"{key}.jsonl"
+    if not path.exists():
+        return []
+    return [memory_module._json_loads(line)["content"] for line in path.read_bytes().splitlines() if line.strip()]
+
+
+class TestSpillFiles:
+    """Local memories are appended to a JSONL file per bucket"""
+    
+    def test_adds_are_written_off_the_event_loop(self, service, spill_dir):
+        async def add():
+            await service.add_memory("c1", "p1", "Column C4 is 450x450", "decision")
+            await service.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            written_during_loop = _spilled_contents(spill_dir)
+            await service.flush_spill()
+            return written_during_loop
+        
+        assert asyncio.run(add()) == []
+        assert _spilled_contents(spill_dir) == ["Column C4 is 450x450", "Slab is 150mm"]
+    
+    def test_spill_file_is_compacted(self, service, spill_dir, monkeypatch):
+        monkeypatch.setattr(memory_module, "LOCAL_SPILL_MAX", 4)
+        monkeypatch.setattr(memory_module, "LOCAL_SPILL_SLACK", 2)
+        
+        async def add():
+            for i in range(9):
+                await service.add_memory("c1", "p1", f"note {i}", "query")
+            await service.flush_spill()
+        
+        asyncio.run(add())
+        
+        # Newest memories survive, the file stays within max + slack
+        contents = _spilled_contents(spill_dir)
+        assert 4 <= len(contents) <= 4 + 2
+        assert contents == [f"note {i}" for i in range(9 - len(contents), 9)]
+
+
+class TestSpillSearch:
+    """Memories evicted from a hot bucket are searched from its spill file"""
+    
+    def _add_three(self, service, monkeypatch):
+        monkeypatch.setattr(memory_module, "LOCAL_BUCKET_MAX", 2)
+        
+        async def add():
+            memories = [
+                await service.add_memory("c1", "p1", content, "decision")
+                for content in ("Slab is 150mm", "Beam is 300mm", "Column is 450mm")
+            ]
+            await service.flush_spill()
+            return memories
+        
+        return asyncio.run(add())
+    
+    def test_scan_runs_off_the_event_loop(self, service, monkeypatch):
+        self._add_three(service, monkeypatch)
+        threads = []
+        iter_spilled = service._iter_spilled
+        
+        def record_thread(*args):
+            threads.append(threading.current_thread())
+            return iter_spilled(*args)
+        
+        monkeypatch.setattr(service, "_iter_spilled", record_thread)
+        results = asyncio.run(service._search_local("c1", "p1", "slab", None, 10))
+        
+        assert [r["content"] for r in results] == ["Slab is 150mm"]
+        assert threads and threading.main_thread() not in threads
+    
+    def test_evicted_memories_searchable_after_release(self, service, monkeypatch):
+        _, _, column = self._add_three(service, monkeypatch)
+        
+        # A released memory leaves the full bucket; the evicted one is still on disk
+        entry = {"company_id": "c1", "project_id": "p1", "type": "decision", "key": "c1_p1", "memory_id": column.id}
+        service._release_local(entry, "doc_1")
+        
+        assert [r["content"] for r in asyncio.run(service._search_local("c1", "p1", "slab", None, 10))] == ["Slab is 150mm"]
+        assert asyncio.run(service._search_local("c1", "p1", "column", None, 10)) == []
+
+
+class TestSearchCache:
+    """Search results cache"""
+    
+    def test_remote_results_are_cached(self, remote):
+        async def search_twice():
+            await remote.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            first = await remote.search("c1", "slab")
+            second = await remote.search("c1", "slab")
+            return first, second
+        
+        first, second = asyncio.run(search_twice())
+        
+        assert first == second
+        assert remote.client.search_calls == 1
+    
+    def test_callers_get_their_own_result_dicts(self, remote):
+        async def edit_then_search():
+            await remote.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            first, waiter = await asyncio.gather(remote.search("c1", "slab"), remote.search("c1", "slab"))
+            first[0]["content"] = "edited"
+            return waiter, await remote.search("c1", "slab")
+        
+        waiter, cached = asyncio.run(edit_then_search())
+        
+        assert waiter[0]["content"] == cached[0]["content"] == "Slab is 150mm"
+    
+    def test_outage_fallback_results_are_not_cached(self, remote):
+        async def search_through_outage():
+            remote.client.down = True
+            await remote.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            during = await remote.search("c1", "slab")
+            remote.client.down = False
+            remote.client.added.append("[DECISION]\n\nSlab is 180mm")
+            after = await remote.search("c1", "slab")
+            return during, after
+        
+        during, after = asyncio.run(search_through_outage())
+        
+        assert [r["content"] for r in during] == ["Slab is 150mm"]
+        assert remote.client.search_calls == 2
+        assert "Slab is 180mm" in [r["content"] for r in after]
+
+    
+    def test_recent_adds_score_on_the_remote_scale(self, remote):
+        async def add_then_search():
+            await remote.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            remote.client.added.pop()  # not indexed by Supermemory yet
+            return await remote.search("c1", "slab")
+        
+        results = asyncio.run(add_then_search())
+        
+        # An exact one-word hit scores 1.0, not 1.0 + the phrase boost
+        assert [(r["content"], r["score"]) for r in results] == [("Slab is 150mm", 1.0)]
+
+class TestMemoryIds:
+    """Ids stay unique for adds within the same second"""
+    
+    def test_supermemory_fallback_ids_are_unique(self, remote):
+        remote.client.add = lambda content, container_tag: SimpleNamespace(id=None)
+        
+        async def add_two():
+            first = await remote.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            second = await remote.add_memory("c1", "p1", "Beam is 300mm", "decision")
+            return first, second
+        
+        first, second = asyncio.run(add_two())
+        
+        assert first.id != second.id
+    
+    def test_local_ids_are_unique(self, service):
+        async def add_two():
+            first = await service.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            second = await service.add_memory("c1", "p1", "Beam is 300mm", "decision")
+            return first, second
+        
+        first, second = asyncio.run(add_two())
+        
+        assert first.id != second.id
+        assert {r["id"] for r in asyncio.run(service._search_local("c1", "p1", "is", None, 10))} == {first.id, second.id}
+
+
+class TestReplay:
+    """Adds that fell back to local during an outage are re-uploaded"""
+    
+    def test_replayed_memory_leaves_local_storage(self, remote, spill_dir):
+        async def outage_then_recovery():
+            remote.client.down = True
+            local = await remote.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            again = await remote.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            remote.client.down = False
+            await remote.add_memory("c1", "p1", "Beam is 300mm", "decision")
+            await remote._replay_task
+            await remote.flush_spill()
+            return local, again, await remote.search("c1", "slab")
+        
+        local, again, results = asyncio.run(outage_then_recovery())
+        
+        assert again.id == local.id
+        assert len(remote.client.added) == 2  # queued once, replayed once
+        assert local.id not in remote._local_memories["c1_p1"]
+        assert asyncio.run(remote._search_local("c1", "p1", "slab", None, 10)) == []
+        assert _spilled_contents(spill_dir) == []
+        assert [r["content"] for r in results].count("Slab is 150mm") == 1
+    
+    def test_failed_replay_keeps_local_copy(self, remote, spill_dir):
+        async def outage():
+            remote.client.down = True
+            memory = await remote.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            await remote.flush_spill()
+            return memory
+        
+        memory = asyncio.run(outage())
+        
+        assert memory.id in remote._local_memories["c1_p1"]
+        assert _spilled_contents(spill_dir) == ["Slab is 150mm"]
+
+    
+    def test_full_queue_drops_oldest_entry(self, remote, monkeypatch):
+        monkeypatch.setattr(memory_module, "REPLAY_QUEUE_MAX", 2)
+        remote.client.down = True
+        
+        async def add_three():
+            return [
+                await remote.add_memory("c1", "p1", content, "decision")
+                for content in ("Slab is 150mm", "Beam is 300mm", "Column is 450mm")
+            ]
+        
+        first, second, third = asyncio.run(add_three())
+        
+        assert [e["memory_id"] for e in remote._replay_queue] == [second.id, third.id]
+        assert remote._replay_ids == {second.id, third.id}
+    
+    def test_replay_updates_local_stats(self, remote):
+        async def outage_then_recovery():
+            remote.client.down = True
+            await remote.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            during = remote.get_local_stats("c1", "p1")
+            remote.client.down = False
+            await remote.add_memory("c1", "p1", "Beam is 300mm", "decision")
+            await remote._replay_task
+            return during
+        
+        during = asyncio.run(outage_then_recovery())
+        
+        assert during["decisions"] == 1
+        assert remote.get_local_stats("c1", "p1")["decisions"] == 0
+        assert remote.get_local_stats("c1")["total"] == 0
+    
+    def test_queue_survives_restart(self, remote, spill_dir):
+        async def outage():
+            remote.client.down = True
+            memory = await remote.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            await remote.flush_spill()
+            return memory
+        
+        memory = asyncio.run(outage())
+        
+        restarted = MemoryService()
+        restarted.client = FakeSupermemory()
+        restarted.restore_local()
+        
+        assert [e["memory_id"] for e in restarted._replay_queue] == [memory.id]
+        
+        async def recovery():
+            await restarted.add_memory("c1", "p1", "Beam is 300mm", "decision")
+            await restarted._replay_task
+            await restarted.flush_spill()
+        
+        asyncio.run(recovery())
+        
+        assert any("Slab is 150mm" in content for content in restarted.client.added)
+        assert _spilled_contents(spill_dir) == []
+        assert restarted.get_local_stats("c1")["total"] == 0
+
+
+class TestRestore:
+    """Local memories come back from spill files after a restart"""
+    
+    def test_construction_does_not_read_spill_files(self, service, spill_dir):
+        asyncio.run(service.add_memory("c1", "p1", "Slab is 150mm", "decision"))
+        
+        fresh = MemoryService()
+        
+        assert fresh._local_memories == {}
+    
+    def test_restore_rebuilds_search_stats_and_ids(self, service, spill_dir):
+        async def add():
+            await service.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            await service.add_memory("c1", "p1", "Column C4 is 450x450", "decision")
+            await service.flush_spill()
+        
+        asyncio.run(add())
+        
+        restored = MemoryService()
+        restored.client = None
+        restored.restore_local()
+        
+        assert [r["content"] for r in asyncio.run(restored._search_local("c1", "p1", "slab", None, 10))] == ["Slab is 150mm"]
+        assert restored.get_local_stats("c1") == service.get_local_stats("c1")
+        
+        # New ids continue after the restored ones instead of reusing them
+        asyncio.run(restored.add_memory("c1", "p1", "Beam is 300mm", "decision"))
+        assert len(restored._local_memories["c1_p1"]) == 3
+
+
+class TestLocalSearch:
+    """Keyword search over local memories"""
+    
+    def test_rarer_words_rank_higher(self, service):
+        async def add():
+            for i in range(5):
+                await service.add_memory("c1", "p1", f"Concrete pour {i} done", "query")
+            await service.add_memory("c1", "p1", "Concrete grade for podium is M40", "decision")
+        
+        asyncio.run(add())
+        results = asyncio.run(service._search_local("c1", "p1", "podium concrete", None, 3))
+        
+        assert results[0]["content"] == "Concrete grade for podium is M40"
+        assert len(results) == 3
+    
+    def test_ties_keep_insertion_order(self, service):
+        contents = [f"Slab {name}" for name in ("alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel")]
+        
+        async def add():
+            for content in contents:
+                await service.add_memory("c1", "p1", content, "decision")
+        
+        asyncio.run(add())
+        results = asyncio.run(service._search_local("c1", "p1", "slab", None, 10))
+        
+        assert [r["content"] for r in results] == contents
+    
+    def test_type_and_project_filters(self, service):
+        async def add():
+            await service.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            await service.add_memory("c1", "p1", "What is the slab cover?", "query")
+            await service.add_memory("c1", "p2", "Slab is 200mm", "decision")
+        
+        asyncio.run(add())
+        
+        assert [r["content"] for r in asyncio.run(service._search_local("c1", "p1", "slab", ["decision"], 10))] == ["Slab is 150mm"]
+        assert len(asyncio.run(service._search_local("c1", None, "slab", None, 10))) == 3
+
+
+class TestLocalStats:
+    """get_local_stats running counters"""
+    
+    def test_counts_by_company_project_and_type(self, service):
+        async def add():
+            await service.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            await service.add_memory("c1", "p1", "Slab is 150mm", "decision")  # duplicate, skipped
+            await service.add_memory("c1", "p1", "What is the cover?", "query")
+            await service.add_memory("c1", "p2", "Shift column C4", "change_order")
+        
+        asyncio.run(add())
+        
+        assert service.get_local_stats("c1") == {
+            "total": 3, "decisions": 1, "change_orders": 1, "rfis": 0, "queries": 1, "documents": 0, "photos": 0,
+        }
+        assert service.get_local_stats("c1", "p2")["change_orders"] == 1
+        assert service.get_local_stats("c1", "p2")["total"] == 1
+        assert service.get_local_stats("c2")["total"] == 0
+
+
+class TestSingleflight:
+    """Identical concurrent searches share one Supermemory call"""
+    
+    def test_concurrent_identical_searches(self, remote):
+        async def search_together():
+            await remote.add_memory("c1", "p1", "Slab is 150mm", "decision")
+            return await asyncio.gather(remote.search("c1", "slab"), remote.search("c1", "slab"))
+        
+        first, second = asyncio.run(search_together())
+        
+        assert first == second
+        assert remote.client.search_calls == 1
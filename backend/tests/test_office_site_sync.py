@@ -0,0 +1,87 @@
+"""
+Office-site sync tests
+Per-project update history, acknowledgements and status text
+"""
+
+import importlib
+
+import pytest
+
+office_site_sync = importlib.import_module("services.office_site_sync")
+
+
+@pytest.fixture
+def sync():
+    """Fresh service (no shared singleton state)"""
+    return office_site_sync.OfficeSiteSyncService()
+
+
+class TestUpdateHistory:
+    """Each project keeps its most recent updates"""
+    
+    def test_old_updates_age_out_with_their_indexes(self, sync, monkeypatch):
+        monkeypatch.setattr(office_site_sync, "UPDATES_PER_PROJECT_MAX", 3)
+        updates = []
+        for i in range(5):
+            update = sync.broadcast_update("p1", "announcement", f"Update {i}", "...", "PM", required_acks=["+911", "+912"])
+            sync.acknowledge_update(update.id, "+911")
+            sync.format_update_notification(update)
+            updates.append(update)
+        
+        assert [u.title for u in sync._updates["p1"]] == ["Update 2", "Update 3", "Update 4"]
+        assert sync.acknowledge_update(updates[0].id, "+912") is False
+        assert sync.get_pending_acknowledgments(updates[0].id) == []
+        assert set(sync._notifications) == {u.id for u in updates[2:]}
+        assert sync._acked_by_phone["+911"] == {u.id for u in updates[2:]}
+    
+    def test_pending_updates_newest_first(self, sync):
+        first = sync.track_drawing_upload("p1", "STR-09", "Office PM")
+        second = sync.track_change_order("p1", "Shift column C4", "Grid B2", "Office PM")
+        third = sync.track_site_report("p1", "Slab poured", "Site Engineer")
+        
+        sync.acknowledge_update(second.id, "+911")
+        
+        assert [u.id for u in sync.get_pending_updates("p1", "+911")] == [third.id, first.id]
+        assert [u.id for u in sync.get_pending_updates("p1", "+912")] == [third.id, second.id, first.id]
+    
+    def test_acknowledgements_are_recorded_once(self, sync):
+        update = sync.broadcast_update("p1", "rfi", "RFI 12", "...", "PM", required_acks=["+911", "+912", "+911"])
+        
+        assert sync.get_pending_acknowledgments(update.id) == ["+911", "+912"]
+        sync.acknowledge_update(update.id, "+911")
+        sync.acknowledge_update(update.id, "+911")
+        
+        assert update.acknowledged_by == ["+911"]
+        assert sync.get_pending_acknowledgments(update.id) == ["+912"]
+
+
+class TestFormatting:
+    """WhatsApp text"""
+    
+    def test_sync_status_uses_the_latest_updates(self, sync):
+        assert sync.get_sync_status("p1") == "No sync updates yet."
+        
+        for i in range(12):
+            sync.broadcast_update("p1", "announcement", f"Announcement number {i:02d} for the whole site", "...", "PM",
+                                  required_acks=["+911"] if i >= 10 else None)
+        
+        assert sync.get_sync_status("p1") == (
+            "**Sync Status**\n\n"
+            "• Recent updates: 5\n"
+            "• Pending acknowledgments: 2\n\n"
+            "**Recent:**\n"
+            "• Announcement number 07 for the... (0 acks)\n"
+            "• Announcement number 08 for the... (0 acks)\n"
+            "• Announcement number 09 for the... (0 acks)\n"
+        )
+    
+    def test_update_notification(self, sync):
+        update = sync.track_drawing_upload("p1", "STR-09", "Office PM")
+        
+        assert sync.format_update_notification(update) == (
+            "📐 **New Drawing: STR-09**\n\n"
+            "A new drawing has been uploaded by Office PM. Please review and acknowledge.\n\n"
+            "From: Office PM (office)\n"
+            f"Time: {update.created_at[:16]}\n\n"
+            "_Reply 'ack' to acknowledge._"
+        )
@@ -0,0 +1,179 @@
+"""
+Office sync service tests
+Activity journal replay and summary formatting
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import services.office_sync_service as office_sync
+from services.office_sync_service import OfficeSyncService
+
+
+@pytest.fixture
+def journal_dir(tmp_path, monkeypatch):
+    """Point the activity journal at a temp directory"""
+    path = tmp_path / "office_sync"
+    monkeypatch.setattr(office_sync, "ACTIVITY_JOURNAL_DIR", path)
+    return path
+
+
+def _track_day(service):
+    service.track_query("p1", "c1", "What is the slab thickness?", "u1")
+    service.track_photo("p1", "c1", None, "u2")
+    service.track_document("p1", "c1", "STR-09.pdf", "u1")
+    service.track_change_order("p1", "c1", "Shift column C4 by 200mm")
+    service.track_safety_flag("p1", "c1", None)
+    service.track_billable("p1", "c1", "Extra excavation")
+    service.track_alert("p1", "c1")
+    service.track_batch("p1", "c1", user_id="u3", queries=["Cover for beams?", None], decisions=["Use M30"])
+
+
+class TestActivityJournal:
+    """Tracked events survive a restart through the JSONL journal"""
+    
+    def test_construction_does_not_read_journals(self, journal_dir):
+        _track_day(OfficeSyncService())
+        
+        fresh = OfficeSyncService()
+        
+        assert fresh.generate_evening_summary("p1", "c1", "Tower A")["stats"]["total_queries"] == 0
+    
+    def test_restore_replays_the_same_totals(self, journal_dir):
+        before = OfficeSyncService()
+        _track_day(before)
+        
+        after = OfficeSyncService()
+        after.restore_activity()
+        
+        expected = before.generate_evening_summary("p1", "c1", "Tower A")
+        restored = after.generate_evening_summary("p1", "c1", "Tower A")
+        for key in ("stats", "attention_needed", "billable_work", "decisions_made", "issues_reported", "top_queries"):
+            assert restored[key] == expected[key]
+        assert after.generate_weekly_report("c1")["totals"] == before.generate_weekly_report("c1")["totals"]
+    
+    def test_missing_text_is_journaled_as_empty(self, journal_dir):
+        service = OfficeSyncService()
+        service.track_photo("p1", "c1", None, "u1")
+        service.track_issue("p1", "c1", None)
+        
+        [journal] = journal_dir.glob("*.jsonl")
+        events = [json.loads(line) for line in journal.read_text().splitlines()]
+        
+        assert [(e["kind"], e["text"]) for e in events] == [("photo", ""), ("issue", "")]
+    
+    def test_writes_happen_off_the_event_loop(self, journal_dir):
+        service = OfficeSyncService()
+        
+        async def track():
+            service.track_query("p1", "c1", "q1", "u1")
+            service.track_query("p1", "c1", "q2", "u1")
+            written_during_loop = any(journal_dir.glob("*.jsonl"))
+            await service.flush_journal()
+            return written_during_loop
+        
+        assert asyncio.run(track()) is False
+        [journal] = journal_dir.glob("*.jsonl")
+        assert [json.loads(line)["text"] for line in journal.read_text().splitlines()] == ["q1", "q2"]
+    
+    def test_restore_drops_journals_past_retention(self, journal_dir):
+        journal_dir.mkdir()
+        old = journal_dir / "2000-01-01.jsonl"
+        old.write_text(json.dumps({
+            "kind": "query", "project_id": "p1", "company_id": "c1", "text": "old", "user_id": "u1",
+        }) + "\n")
+        
+        service = OfficeSyncService()
+        service.restore_activity()
+        
+        assert not old.exists()
+        assert service.generate_weekly_report("c1")["totals"]["queries"] == 0
+
+
+class TestSummaryFormatting:
+    """WhatsApp summary text"""
+    
+    def test_evening_summary_text(self, journal_dir):
+        service = OfficeSyncService()
+        service.track_query("p1", "c1", "What is the slab thickness?", "u1")
+        service.track_change_order("p1", "c1", "Shift column C4")
+        service.track_billable("p1", "c1", "Extra excavation")
+        
+        summary = service.generate_evening_summary("p1", "c1", "Tower A")
+        text = service.format_evening_summary_whatsapp(summary)
+        
+        assert text == (
+            f"🟡 *Evening Summary: Tower A*\n"
+            f"📅 {summary['date']}\n"
+            "\n"
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+            "\n"
+            "📊 *Today's Activity:*\n"
+            "• Queries: 1\n"
+            "• Photos: 0\n"
+            "• Documents: 0\n"
+            "• Active Users: 1\n"
+            "\n"
+            "🚨 *Needs Attention:*\n"
+            "• 📝 New Change Orders: 1\n"
+            "\n"
+            "💰 *Billable Work:*\n"
+            "• Extra excavation\n"
+            "\n"
+            "✅ *Decisions Made:*\n"
+            "• Change: Shift column C4\n"
+            "\n"
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+            "🟡 Items need your approval or review"
+        )
+    
+    def test_weekly_report_text(self, journal_dir):
+        service = OfficeSyncService()
+        service.track_query("p1", "c1", "q", "u1")
+        service.track_photo("p1", "c1", "", "u1")
+        service.track_safety_flag("p1", "c1", "No harness")
+        
+        report = service.generate_weekly_report("c1")
+        text = service.format_weekly_report_whatsapp(report)
+        
+        assert text.startswith(f"📊 *Weekly Report*\n📅 {report['period']}\n")
+        assert "• Total Queries: 1\n• Photos Analyzed: 1\n• Documents Uploaded: 0\n" in text
+        assert "• Change Orders: 0\n• Safety Flags: 1\n• Billable Items: 0\n" in text
+        assert text.endswith("_Full report available on dashboard._")
+    
+    def test_empty_summaries_do_not_share_lists(self, journal_dir):
+        service = OfficeSyncService()
+        
+        first = service.generate_evening_summary("p1", "c1", "Tower A")
+        first["decisions_made"].append("Changed by a caller")
+        first["issues_reported"].append("Changed by a caller")
+        second = service.generate_evening_summary("p2", "c1", "Tower B")
+        
+        assert second["decisions_made"] == []
+        assert second["issues_reported"] == []
+    
+    def test_summary_text_follows_activity_changes(self, journal_dir):
+        service = OfficeSyncService()
+        service.track_query("p1", "c1", "q1", "u1")
+        stale = service.generate_evening_summary("p1", "c1", "Tower A")
+        assert "• Queries: 1\n" in service.format_evening_summary_whatsapp(stale)
+        
+        service.track_query("p1", "c1", "q2", "u1")
+        current = service.generate_evening_summary("p1", "c1", "Tower A")
+        
+        assert "• Queries: 2\n" in service.format_evening_summary_whatsapp(current)
+        assert "• Queries: 1\n" in service.format_evening_summary_whatsapp(stale)
+        assert "• Queries: 2\n" in service.format_evening_summary_whatsapp(current)
+    
+    def test_summary_text_after_restore(self, journal_dir):
+        OfficeSyncService().track_query("p1", "c1", "q1", "u1")
+        service = OfficeSyncService()
+        empty = service.generate_evening_summary("p1", "c1", "Tower A")
+        assert "• Queries: 0\n" in service.format_evening_summary_whatsapp(empty)
+        
+        service.restore_activity()
+        restored = service.generate_evening_summary("p1", "c1", "Tower A")
+        
+        assert "• Queries: 1\n" in service.format_evening_summary_whatsapp(restored)
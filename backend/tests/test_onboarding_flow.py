@@ -0,0 +1,103 @@
+"""
+Onboarding flow tests
+Step tracking, progress and message templates
+"""
+
+import asyncio
+import importlib
+
+import pytest
+
+onboarding_flow = importlib.import_module("services.onboarding_flow")
+
+
+@pytest.fixture
+def flow(monkeypatch):
+    """Fresh flow with WhatsApp sends recorded instead of sent"""
+    sent = []
+    
+    async def send_message(phone, message):
+        sent.append((phone, message))
+        return {"status": "sent"}
+    
+    monkeypatch.setattr(onboarding_flow.whatsapp_service, "send_message", send_message)
+    flow = onboarding_flow.OnboardingService()
+    flow.sent = sent
+    return flow
+
+
+def _run_all_steps(flow, repeat=1):
+    async def run():
+        await flow.start_onboarding("c1", "Acme Builders", "+919876543210", "Ravi")
+        for _ in range(repeat):
+            await flow.handle_first_drawing("c1", "p1", "STR-09.pdf", [{"element": "Column"}], "+919876543210")
+            await flow.format_first_answer("c1", "Column size?", "450x450", ["STR-09"], "+919876543210")
+            await flow.format_first_photo_analysis("c1", "Looks right", ["Column C4"], False)
+        await flow.send_dashboard_intro("c1", "Acme Builders", "+919876543210", {"specs": 1})
+    
+    asyncio.run(run())
+
+
+class TestProgress:
+    """get_onboarding_progress"""
+    
+    def test_not_started(self, flow):
+        assert flow.get_onboarding_progress("c1") == {"status": "not_started"}
+    
+    def test_progress_follows_completed_steps(self, flow):
+        asyncio.run(flow.start_onboarding("c1", "Acme Builders", "+919876543210", "Ravi"))
+        
+        progress = flow.get_onboarding_progress("c1")
+        
+        assert progress["steps_complete"] == 1
+        assert progress["total_steps"] == onboarding_flow.ONBOARDING_TOTAL_STEPS == 5
+        assert progress["progress_percent"] == 20.0
+        assert progress["status"] == "in_progress"
+    
+    def test_repeated_steps_count_once(self, flow):
+        _run_all_steps(flow, repeat=3)
+        
+        progress = flow.get_onboarding_progress("c1")
+        
+        assert progress["steps_complete"] == 5
+        assert progress["progress_percent"] == 100.0
+        assert progress["status"] == "complete"
+        assert progress["wow_moments"] == 5  # 3 drawings, first answer, first photo
+    
+    def test_completed_onboarding_stays_visible(self, flow):
+        _run_all_steps(flow)
+        
+        assert "c1" not in flow._states
+        assert flow.get_onboarding_progress("c1")["steps_complete"] == 5
+
+
+class TestMessages:
+    """Message templates"""
+    
+    def test_welcome_message(self, flow):
+        welcome = asyncio.run(flow.start_onboarding("c1", "Acme {Builders}", "+919876543210", "Ravi"))
+        
+        assert "🧠 *Welcome to SiteMind, Ravi!*" in welcome
+        assert "Your Project Brain for *Acme {Builders}* is now active." in welcome
+        assert flow.sent == [("+919876543210", welcome)]
+    
+    def test_drawing_response_lists_first_eight_specs(self, flow):
+        specs = [
+            {"element": f"Column C{i}", "location": "Grid B2", "details": {"size": "450x450", "rebar": "8-20mm", "cover": "40mm", "grade": "M30"}}
+            for i in range(10)
+        ]
+        
+        response = asyncio.run(flow.handle_first_drawing("c1", "p1", "STR-09.pdf", specs, "+919876543210"))
+        
+        assert "📄 *STR-09.pdf*" in response
+        assert "🔍 *I found 10 specifications:*" in response
+        assert "   1. *Column C0* @ Grid B2\n      _size: 450x450, rebar: 8-20mm, cover: 40mm_" in response
+        assert "   8. *Column C7* @ Grid B2" in response
+        assert "Column C8" not in response
+        assert "\n   _...and 2 more_\n" in response
+    
+    def test_dashboard_intro(self, flow):
+        response = asyncio.run(flow.send_dashboard_intro("c1", "Acme Builders", "+919876543210", {}))
+        
+        assert "• 📐 All 0 specifications stored" in response
+        assert "Your Project Brain is ready for *Acme Builders*." in response
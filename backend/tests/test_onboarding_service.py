@@ -0,0 +1,131 @@
+"""
+Onboarding service tests
+Phone dedup, project membership and organization scoping
+"""
+
+import pytest
+
+from services.onboarding_service import OnboardingService
+
+
+@pytest.fixture
+def service():
+    """Fresh service (no shared singleton state)"""
+    return OnboardingService()
+
+
+def _org_session(service, name="Acme Builders", admin_phone="9000000001"):
+    session = service.start_session()
+    service.create_organization(session.id, name)
+    service.create_admin_user(session.id, "Admin", "admin@example.com", admin_phone)
+    return session
+
+
+class TestPhoneDedup:
+    """Same phone added more than once"""
+    
+    def test_repeat_in_same_project_keeps_one_user(self, service):
+        session = _org_session(service)
+        project = service.add_project(session.id, "Tower A")
+        
+        first = service.add_team_member(session.id, project["id"], "Ravi", "98765 43210")
+        second = service.add_team_member(session.id, project["id"], "Ravi", "+919876543210")
+        
+        assert first["id"] == second["id"]
+        assert len(session.team_members) == 1
+        assert [u["id"] for u in service.list_users(project_id=project["id"])] == [first["id"]]
+    
+    def test_second_project_adds_membership(self, service):
+        session = _org_session(service)
+        p1 = service.add_project(session.id, "Tower A")
+        p2 = service.add_project(session.id, "Tower B")
+        
+        ravi = service.add_team_member(session.id, p1["id"], "Ravi", "9876543210")
+        again = service.add_team_member(session.id, p2["id"], "Ravi", "9876543210")
+        
+        assert again["id"] == ravi["id"]
+        assert [u["id"] for u in service.list_users(project_id=p1["id"])] == [ravi["id"]]
+        assert [u["id"] for u in service.list_users(project_id=p2["id"])] == [ravi["id"]]
+    
+    def test_other_organization_gets_its_own_user(self, service):
+        org_a = _org_session(service, "Acme Builders")
+        org_b = _org_session(service, "Bharat Infra", admin_phone="9000000002")
+        pa = service.add_project(org_a.id, "Tower A")
+        pb = service.add_project(org_b.id, "Mall B")
+        
+        in_a = service.add_team_member(org_a.id, pa["id"], "Ravi", "9876543210")
+        in_b = service.add_team_member(org_b.id, pb["id"], "Ravi", "9876543210")
+        
+        assert in_b["id"] != in_a["id"]
+        assert in_b["organization_id"] == org_b.organization_id
+        assert in_b["role"] == "site_engineer"
+        assert [m.id for m in org_b.team_members] == [in_b["id"]]
+        assert in_b["id"] in [u["id"] for u in service.list_users(org_id=org_b.organization_id)]
+        assert [u["id"] for u in service.list_users(project_id=pb["id"])] == [in_b["id"]]
+    
+    def test_other_organizations_admin_is_not_reused(self, service):
+        org_a = _org_session(service, "Acme Builders", admin_phone="9000000001")
+        org_b = _org_session(service, "Bharat Infra", admin_phone="9000000002")
+        pb = service.add_project(org_b.id, "Mall B")
+        
+        member = service.add_team_member(org_b.id, pb["id"], "Anil", "9000000001")
+        
+        assert member["id"] != org_a.admin_user.id
+        assert member["role"] == "site_engineer"
+        assert member["organization_id"] == org_b.organization_id
+    
+    def test_lookup_by_phone_returns_first_user(self, service):
+        org_a = _org_session(service, "Acme Builders")
+        org_b = _org_session(service, "Bharat Infra", admin_phone="9000000002")
+        pa = service.add_project(org_a.id, "Tower A")
+        pb = service.add_project(org_b.id, "Mall B")
+        
+        in_a = service.add_team_member(org_a.id, pa["id"], "Ravi", "9876543210")
+        service.add_team_member(org_b.id, pb["id"], "Ravi", "9876543210")
+        
+        assert service.get_user_by_phone("98765-43210")["id"] == in_a["id"]
+
+
+class TestBulkAdd:
+    """add_team_members"""
+    
+    def test_bulk_dedups_within_batch_and_registers_projects(self, service):
+        session = _org_session(service)
+        p1 = service.add_project(session.id, "Tower A")
+        p2 = service.add_project(session.id, "Tower B")
+        
+        users = service.add_team_members(session.id, [
+            {"name": "Ravi", "phone": "9876543210"},
+            {"name": "Sita", "phone": "9876500000", "role": "pm"},
+            {"name": "Ravi", "phone": "98765 43210", "project_id": p2["id"]},
+        ], project_id=p1["id"])
+        
+        assert users[0]["id"] == users[2]["id"]
+        assert users[1]["role"] == "pm"
+        assert len(session.team_members) == 2
+        assert [u["name"] for u in service.list_users(project_id=p1["id"])] == ["Ravi", "Sita"]
+        assert [u["name"] for u in service.list_users(project_id=p2["id"])] == ["Ravi"]
+    
+    def test_bulk_existing_member_joins_new_project(self, service):
+        session = _org_session(service)
+        p1 = service.add_project(session.id, "Tower A")
+        p2 = service.add_project(session.id, "Tower B")
+        ravi = service.add_team_member(session.id, p1["id"], "Ravi", "9876543210")
+        
+        users = service.add_team_members(session.id, [{"name": "Ravi", "phone": "9876543210"}], project_id=p2["id"])
+        
+        assert users[0]["id"] == ravi["id"]
+        assert [u["id"] for u in service.list_users(project_id=p2["id"])] == [ravi["id"]]
+    
+    def test_bulk_other_organization_creates_new_users(self, service):
+        org_a = _org_session(service, "Acme Builders")
+        org_b = _org_session(service, "Bharat Infra", admin_phone="9000000002")
+        pa = service.add_project(org_a.id, "Tower A")
+        pb = service.add_project(org_b.id, "Mall B")
+        in_a = service.add_team_member(org_a.id, pa["id"], "Ravi", "9876543210")
+        
+        users = service.add_team_members(org_b.id, [{"name": "Ravi", "phone": "9876543210"}], project_id=pb["id"])
+        
+        assert users[0]["id"] != in_a["id"]
+        assert users[0]["organization_id"] == org_b.organization_id
+        assert [m.id for m in org_b.team_members] == [users[0]["id"]]
@@ -0,0 +1,53 @@
+"""
+First-hour WOW message tests
+"""
+
+import importlib
+
+import pytest
+
+onboarding_wow = importlib.import_module("services.onboarding_wow")
+
+
+@pytest.fixture
+def wow():
+    return onboarding_wow.OnboardingWowService()
+
+
+class TestValueMessages:
+    """Messages that quote money figures"""
+    
+    def test_mismatch_caught_figures(self, wow):
+        message = wow.get_mismatch_caught_response(
+            "Column C4 rebar", "8-16mm", "8-20mm", "STR-09", 249000,
+        )
+        
+        assert "Column C4 rebar" in message
+        assert message.count("₹2.5") == 3
+        assert "3x" in message
+        assert "₹83,000" in message
+    
+    def test_30_minute_checkin_markers(self, wow):
+        message = wow.get_30_minute_checkin("Acme Builders", {"specs": 4, "queries": 0, "photos": 2, "value_protected": 150000})
+        
+        assert "Acme Builders" in message
+        assert "✅" in message and "⬜" in message
+        assert "₹1.5" in message
+    
+    def test_first_hour_summary(self, wow):
+        quiet = wow.get_first_hour_summary("Acme Builders", {})
+        busy = wow.get_first_hour_summary("Acme Builders", {"documents": 2, "specs": 30, "value_protected": 166000})
+        
+        assert "CONGRATULATIONS" not in quiet
+        assert "paid for itself" not in quiet
+        assert "🏆 *CONGRATULATIONS!*" in busy
+        assert "SiteMind already paid for itself!" in busy
+        assert "₹1.7" in busy
+
+
+class TestWelcome:
+    def test_premium_welcome_keeps_braces_in_names(self, wow):
+        message = wow.get_premium_welcome("Acme {Builders}", "Ravi")
+        
+        assert "Acme {Builders}" in message
+        assert "Ravi" in message
@@ -0,0 +1,65 @@
+"""
+Welcome message tests
+Role-based templates for WhatsApp welcomes and team invites
+"""
+
+import asyncio
+
+import pytest
+
+from services.team_management import TeamManagementService
+from services.whatsapp_client import WhatsAppClient
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """WhatsApp client that records messages instead of sending them"""
+    client = WhatsAppClient()
+    client.sent = []
+    
+    async def send_message(phone, message):
+        client.sent.append(message)
+        return {"status": "sent"}
+    
+    monkeypatch.setattr(client, "send_message", send_message)
+    return client
+
+
+class TestWhatsAppWelcome:
+    """WhatsAppClient.send_welcome"""
+    
+    def test_owner_and_admin_welcome(self, client):
+        asyncio.run(client.send_welcome("+911", "Ravi", "admin", "Acme Builders"))
+        
+        assert client.sent[0].startswith("Welcome to SiteMind, Ravi! 🎉\n\nYou're now set up as admin for Acme Builders.\n")
+    
+    def test_pm_welcome(self, client):
+        asyncio.run(client.send_welcome("+911", "Sita", "pm", "Acme Builders"))
+        
+        assert client.sent[0].startswith("Welcome to SiteMind, Sita!\n\nYou've been added as Project Manager for Acme Builders.\n")
+    
+    def test_other_roles_get_engineer_welcome(self, client):
+        asyncio.run(client.send_welcome("+911", "Anil", "consultant", "Acme Builders"))
+        
+        assert client.sent[0].startswith("Welcome to SiteMind, Anil!\n\nYou've been added to Acme Builders's project team.\n")
+        assert client.sent[0].endswith("Try it now: Send any question about the project!")
+
+
+class TestTeamInviteWelcome:
+    """TeamManagementService._generate_welcome_message"""
+    
+    def test_manager_roles(self):
+        service = TeamManagementService()
+        
+        message = service._generate_welcome_message("Sita", "pm", "org_test")
+        
+        assert message.startswith("Welcome to SiteMind, Sita! 👋\n\nYou've been added as **Project Manager**.\n")
+        assert "• `add team [name] [phone] [role]` - Add someone\n" in message
+    
+    def test_member_roles(self):
+        service = TeamManagementService()
+        
+        message = service._generate_welcome_message("Anil {x}", "site_engineer", "org_test")
+        
+        assert message.startswith("Welcome to SiteMind, Anil {x}! 👋\n\nYou've been added to the project team.\n")
+        assert message.endswith('Example: "beam size B3 floor 2?"\n\nTry it now!')